@@ -1,12 +1,28 @@
-from .data import (DataReader)
-from .data import (StockListing)
-from .data import (StockListingAll)
-from .data import (EtfListing)
-from . import (chart)
-
 __version__ = '0.0.6'
 
 """
 import 할 수 있는 모듈을 정의 (함수임)
 """
-__all__ = ['__version__', 'DataReader', 'StockListingAll', 'StockListing', 'EtfListing', 'chart']
+__all__ = ['__version__', 'DataReader', 'DataReaderMany', 'StockListingAll', 'StockListing', 'StockListingHistory', 'EtfListing', 'chart', 'transport', 'aio', 'trading_calendar']
+
+"""
+reader 모듈과 무거운 의존성(selenium, cloudscraper, bs4, numpy, requests ...)은 처음 사용할 때 import 한다
+"""
+_data_functions = ['DataReader', 'DataReaderMany', 'StockListing', 'StockListingAll', 'StockListingHistory', 'EtfListing']
+_submodules = ['chart', 'transport', 'aio', 'trading_calendar']
+
+
+def __getattr__(name):
+    import importlib
+    if name in _data_functions:
+        value = getattr(importlib.import_module('.data', __name__), name)
+    elif name in _submodules:
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from requests.structures import CaseInsensitiveDict
+
+
+def _cache_key(method, url, data=None, params=None):
+    raw = json.dumps([method.upper(), url, data, params], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class CachedResponse:
+    '''
+    response served from the cache, with the parts of requests.Response the readers use
+    '''
+    def __init__(self, entry):
+        self.status_code = entry['status_code']
+        self.headers = entry['headers']
+        self.content = entry['content']
+        self.encoding = entry['encoding']
+        self.url = entry['url']
+        self.reason = 'OK'
+        self.ok = True
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryCache:
+    '''
+    in-memory LRU backend
+    * maxsize: number of responses kept
+    '''
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    '''
+    on-disk backend, one pickle file per response
+    * cache_dir: directory of the files
+    * max_entries: number of files kept, the least recently used are removed beyond it (None: unbounded)
+    '''
+    def __init__(self, cache_dir, max_entries=1024):
+        self.path = os.path.expanduser(cache_dir)
+        self.max_entries = max_entries
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f'{key}.pkl')
+
+    def get(self, key):
+        fn = self._file(key)
+        try:
+            with open(fn, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        try:
+            os.utime(fn)  # 수정 시각을 최근 사용 시각으로
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key, entry):
+        fn = self._file(key)
+        tmp = f'{fn}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, fn)  # 쓰는 도중에 읽는 경우를 막기 위해 교체 방식으로 저장
+        if self.max_entries is not None:
+            self._prune()
+
+    def _prune(self):
+        files = []
+        for e in os.scandir(self.path):
+            if e.name.endswith('.pkl'):
+                try:
+                    files.append((e.stat().st_mtime, e.path))
+                except OSError:
+                    pass  # 다른 프로세스가 먼저 지운 경우
+        if len(files) <= self.max_entries:
+            return
+        files.sort()
+        for _, fn in files[:len(files) - self.max_entries]:
+            try:
+                os.remove(fn)
+            except OSError:
+                pass
+
+    def clear(self):
+        for fn in os.listdir(self.path):
+            if fn.endswith('.pkl'):
+                os.remove(os.path.join(self.path, fn))
+
+
+class ResponseCache:
+    '''
+    response cache of the transports: backends are looked up in order (ex: memory, then disk)
+    and a hit in a later backend is copied into the earlier ones
+    * backends: list of MemoryCache, DiskCache or any object with get(key), set(key, entry), clear()
+    an entry is fresh for the ttl given by the caller. a stale entry having ETag or Last-Modified
+    is revalidated with a conditional request, and reused as is on 304 Not Modified
+    '''
+    def __init__(self, backends=None):
+        self.backends = list(backends) if backends is not None else [MemoryCache()]
+
+    def get(self, key):
+        for i, backend in enumerate(self.backends):
+            entry = backend.get(key)
+            if entry is not None:
+                for earlier in self.backends[:i]:
+                    earlier.set(key, entry)
+                return entry
+        return None
+
+    def set(self, key, entry):
+        for backend in self.backends:
+            backend.set(key, entry)
+
+    def clear(self):
+        for backend in self.backends:
+            backend.clear()
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return time.time() - entry['stored'] < ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def store(self, key, status_code, headers, content, encoding, url):
+        entry = {
+            'status_code': status_code,
+            'headers': CaseInsensitiveDict(headers),
+            'content': content,
+            'encoding': encoding,
+            'url': url,
+            'stored': time.time(),
+        }
+        self.set(key, entry)
+        return entry
+
+    def touch(self, key, entry):
+        # 304 Not Modified: 저장된 내용을 그대로 두고 저장 시각만 갱신
+        entry = dict(entry, stored=time.time())
+        self.set(key, entry)
+        return entry
@@ -0,0 +1,64 @@
+import os
+import threading
+import pandas as pd
+
+
+def _parquet_engine_available():
+    for engine in ['pyarrow', 'fastparquet']:
+        try:
+            __import__(engine)
+            return True
+        except ImportError:
+            pass
+    return False
+
+
+class ColumnarStore:
+    '''
+    on-disk columnar store, one partition(file) per symbol
+    * cache_dir: root directory of the store
+    * namespace: sub directory (ex: 'naver/day')
+    parquet is used when pyarrow or fastparquet is installed, otherwise pickle
+    '''
+    def __init__(self, cache_dir, namespace=''):
+        self.path = os.path.join(os.path.expanduser(cache_dir), namespace)
+        os.makedirs(self.path, exist_ok=True)
+        self.ext = 'parquet' if _parquet_engine_available() else 'pkl'
+
+    def _file(self, symbol):
+        name = symbol.replace('/', '_')
+        return os.path.join(self.path, f'{name}.{self.ext}')
+
+    def load(self, symbol):
+        fn = self._file(symbol)
+        if not os.path.exists(fn):
+            return None
+        if self.ext == 'parquet':
+            return pd.read_parquet(fn)
+        return pd.read_pickle(fn)
+
+    def save(self, symbol, df):
+        fn = self._file(symbol)
+        tmp = f'{fn}.{os.getpid()}.{threading.get_ident()}.tmp'
+        if self.ext == 'parquet':
+            df.to_parquet(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, fn)  # 쓰는 도중에 읽는 경우를 막기 위해 교체 방식으로 저장
+
+    def append(self, symbol, df):
+        '''
+        merge new rows into the stored partition (new rows win on the same index) and return the merged frame
+        '''
+        stored = self.load(symbol)
+        if stored is not None and len(stored):
+            df = pd.concat([stored, df])
+            df = df[~df.index.duplicated(keep='last')]
+        df = df.sort_index()
+        self.save(symbol, df)
+        return df
+
+    def remove(self, symbol):
+        fn = self._file(symbol)
+        if os.path.exists(fn):
+            os.remove(fn)
@@ -1,6 +1,10 @@
+import os
 import re
+import warnings
+import numpy as np
 from datetime import datetime
-from pandas import DataFrame, to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pandas import DataFrame, Series, DatetimeIndex, Index, isna, to_datetime, to_timedelta
 
 
 def _convert_letter_to_num(str_num):
@@ -13,13 +17,40 @@ def _convert_letter_to_num(str_num):
     return 0.0
 
 
+def _convert_letter_to_num_series(s: Series):
+    """
+    Vectorized _convert_letter_to_num: the same first match of the same regex on every cell,
+    so '1.5M' -> 1500000.0, '1,234K' -> 1.0 (the match stops at the comma), '-' and '' -> 0.0.
+    Missing cells (NaN) give 0.0.
+
+    :param s: Series of strings
+    :return: Series of float
+    """
+    powers = {'B': 10 ** 9, 'M': 10 ** 6, 'K': 10 ** 3, '': 1}
+    parts = s.str.extract(r"([0-9\.]+)(M|B|K|)", expand=True)
+    values = parts[0].astype(float) * parts[1].map(powers).astype(float)
+    return values.fillna(0.0)
+
+
+def _default_cache_dir():
+    """
+    Directory of the data the library keeps between runs (symbol maps ...):
+    $FDR_CACHE_DIR, else $XDG_CACHE_HOME/FinanceDataReader, else ~/.cache/FinanceDataReader
+    """
+    if os.environ.get('FDR_CACHE_DIR'):
+        return os.path.expanduser(os.environ['FDR_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'FinanceDataReader')
+
+
 def _validate_dates(start, end):
     start = to_datetime(start)
     end = to_datetime(end)
 
-    if start is None:
+    # pandas 버전에 따라 to_datetime(None) 은 None 또는 NaT
+    if start is None or isna(start):
         start = datetime(1970, 1, 1)
-    if end is None:
+    if end is None or isna(end):
         end = datetime.today()
     return start, end
 
@@ -27,14 +58,18 @@ def _validate_dates(start, end):
 def _filter_by_date(df: DataFrame, start, end):
     """
     Retrieves a dataframe based on a given start and end date.
+    The rows are found by binary search on the sorted index and returned as a positional slice,
+    which can be a view of df: copy it before mutating.
 
     :param df: an original dataframe
     :param start: start date
     :param end: end date
     """
-    date_query = 'index>=%r and index<=%r'
-    filtered_df = df.query(date_query % (start, end))
-    return filtered_df
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    lo = df.index.searchsorted(to_datetime(start), side='left')
+    hi = df.index.searchsorted(to_datetime(end), side='right')
+    return df.iloc[lo:hi]
 
 
 def _replace_ohl_0_with_c(df: DataFrame):
@@ -53,3 +88,133 @@ def _replace_ohl_0_with_c(df: DataFrame):
 
     df.loc[is_trading_holiday, replace_target_columns] = replace_value
     return df
+
+
+def _to_panel(frames, fields=None):
+    """
+    Align the frames of many symbols into one Date x Symbol matrix per field.
+    Each matrix is a preallocated float64 array over the union of the dates (NaN where a symbol has no row),
+    and the row positions of a symbol are computed once and reused for every field.
+
+    :param frames: {symbol: DataFrame indexed by date}
+    :param fields: columns to build (default: Open, High, Low, Close, Volume, Change present in the frames)
+    :return: {field: DataFrame (index: Date, columns: Symbol)}
+    """
+    symbols = [symbol for symbol, df in frames.items() if len(df)]
+    not_dated = [symbol for symbol in symbols if not isinstance(frames[symbol].index, DatetimeIndex)]
+    if not_dated:
+        raise ValueError(f'frames of {not_dated} are not indexed by date (DatetimeIndex)')
+    if fields is None:
+        fields = [field for field in ['Open', 'High', 'Low', 'Close', 'Volume', 'Change']
+                  if any(field in frames[symbol] for symbol in symbols)]
+    if symbols:
+        dates = np.unique(np.concatenate([frames[symbol].index.values for symbol in symbols]))
+    else:
+        dates = np.array([], dtype='datetime64[ns]')
+    positions = {symbol: dates.searchsorted(frames[symbol].index.values) for symbol in symbols}
+
+    index = DatetimeIndex(dates, name='Date')
+    columns = Index(list(frames), name='Symbol')
+    col_pos = {symbol: j for j, symbol in enumerate(columns)}
+    panel = {}
+    for field in fields:
+        values = np.full((len(dates), len(columns)), np.nan)
+        for symbol in symbols:
+            if field in frames[symbol]:
+                values[positions[symbol], col_pos[symbol]] = frames[symbol][field].to_numpy(dtype=float)
+        panel[field] = DataFrame(values, index=index, columns=columns, copy=False)
+    return panel
+
+
+def _compact(df: DataFrame, category_ratio=0.5):
+    """
+    Downcast the columns of a frame without losing values.
+    integers (and finite integral floats within +-2**53) -> int32, else uint32, else int64 as the range allows
+    other floats -> float32 when every value survives the round trip
+    strings with few distinct values (distinct / rows <= category_ratio) -> category
+
+    :param df: an original dataframe (not modified)
+    """
+    if not len(df):
+        return df
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        kind = s.dtype.kind
+        if kind == 'f':
+            values = s.to_numpy()
+            # 정수 변환은 유한하고 float64 가 정수를 정확히 표현하는 범위(|x| <= 2**53)일 때만
+            if np.isfinite(values).all() and (np.abs(values) <= 2 ** 53).all() \
+                    and np.array_equal(values, np.round(values)):
+                kind, s = 'i', s.astype(np.int64)
+            else:
+                as_float32 = values.astype(np.float32)
+                if np.array_equal(as_float32.astype(np.float64), values, equal_nan=True):
+                    df[col] = as_float32
+                continue
+        if kind in 'iu':
+            lo, hi = s.min(), s.max()
+            if np.iinfo(np.int32).min <= lo and hi <= np.iinfo(np.int32).max:
+                df[col] = s.astype(np.int32)
+            elif 0 <= lo and hi <= np.iinfo(np.uint32).max:
+                df[col] = s.astype(np.uint32)
+            else:
+                df[col] = s.astype(np.int64)
+        elif kind == 'O' and s.dropna().map(type).eq(str).all() and s.nunique() <= len(s) * category_ratio:
+            df[col] = s.astype('category')
+    return df
+
+
+def _monthly_return_volatility(prices, base=None, months=12, month_days=int(365 / 12)):
+    """
+    Standard deviation of the monthly returns over the last `months` months.
+    Anchor dates are `month_days` apart going back from `base`,
+    and the price of an anchor is the last price on or before it.
+
+    :param prices: close prices, a Series or a DataFrame (one column per symbol)
+    :param base: most recent anchor date (default: last date of prices)
+    :return: float for a Series, Series by symbol for a DataFrame (NaN when the history is shorter than the period)
+    """
+    prices = prices.sort_index()
+    base = prices.index[-1] if base is None else to_datetime(base)
+    anchors = base - to_timedelta(np.arange(months + 1) * month_days, unit='D')
+    values = prices.ffill().reindex(anchors, method='ffill').to_numpy(dtype=float)
+    returns = values[:-1] / values[1:] - 1.
+    std = np.std(returns, axis=0)
+    if isinstance(prices, DataFrame):
+        return Series(std, index=prices.columns)
+    return float(std)
+
+
+def _map_symbols(func, symbols, max_workers=8, retries=2, progress_every=20, label='symbols'):
+    """
+    Run func(symbol) for each symbol on a thread pool.
+    A symbol that raises is retried `retries` more times, then reported with a single warning.
+
+    :param func: per-symbol work, returns a plain record (dict)
+    :param label: what the symbols are, in the warning ('symbols', 'days' ...)
+    :return: ({symbol: record}, {symbol: exception})
+    """
+    def _run(symbol):
+        for attempt in range(retries + 1):
+            try:
+                return func(symbol)
+            except Exception:
+                if attempt == retries:
+                    raise
+
+    records, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_run, symbol): symbol for symbol in symbols}
+        for done, future in enumerate(as_completed(futures), 1):
+            symbol = futures[future]
+            try:
+                records[symbol] = future.result()
+            except Exception as e:
+                errors[symbol] = e
+            if progress_every and done % progress_every == 0:
+                print(f'진행상황:{done}/{len(futures)}')
+    if errors:
+        msg = ', '.join(f'{symbol}({type(e).__name__}: {e})' for symbol, e in errors.items())
+        warnings.warn(f'{len(errors)} of {len(futures)} {label} failed: {msg}')
+    return records, errors
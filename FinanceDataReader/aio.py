@@ -0,0 +1,276 @@
+import json
+import math
+import asyncio
+import functools
+from urllib.parse import urlsplit
+from FinanceDataReader._utils import (_validate_dates)
+from FinanceDataReader import transport as sync_transport
+from FinanceDataReader._cache import _cache_key
+
+aiohttp_install_msg = '''
+aiohttp not installed. please install as follows
+
+비동기(asyncio) API 는 aiohttp 에 의존성이 있습니다.
+다음과 같이 aiohttp를 설치하세요
+
+pip install aiohttp
+
+'''
+
+
+class AsyncResponse:
+    '''
+    body of a finished aiohttp response, with the parts of requests.Response the readers use
+    '''
+    def __init__(self, status_code, headers, content, encoding=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncTransport:
+    '''
+    aiohttp transport shared by the async readers
+    * limit_per_host: max number of requests in flight per host
+    * limit: max number of requests in flight in total
+    * timeout: timeout (seconds) of each request
+    * headers: default headers sent with every request
+    * limiter: RateLimiter of the requests (None: the one shared with the sync transport)
+    * max_retries: number of retries of a request answered with 429, 502, 503, 504
+    '''
+    def __init__(self, limit_per_host=8, limit=256, timeout=30, headers=None, limiter=None, max_retries=3):
+        self.limit_per_host = limit_per_host
+        self.limit = limit
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self._session = None
+        self._loop = None
+
+    def _get_session(self):
+        try:
+            import aiohttp
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError(aiohttp_install_msg)
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # 세션은 이벤트 루프에 묶이므로 루프가 바뀌면(asyncio.run 을 다시 호출하는 경우) 새로 만든다
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._loop = loop
+        return self._session
+
+    async def request(self, method, url, cache_ttl=None, **kwargs):
+        '''
+        * cache_ttl: seconds a response of this endpoint stays fresh in the response cache (None: not cached)
+        the response cache is shared with the sync transport
+        '''
+        cache = sync_transport.get_response_cache() if cache_ttl else None
+        if cache is None:
+            return await self._send(method, url, **kwargs)
+
+        key = _cache_key(method, url, kwargs.get('data'), kwargs.get('params'))
+        entry = cache.get(key)
+        if entry is not None:
+            if cache.is_fresh(entry, cache_ttl):
+                return self._from_entry(entry)
+            conditional = cache.conditional_headers(entry)
+            if conditional:
+                kwargs['headers'] = dict(kwargs.get('headers') or {}, **conditional)
+        r = await self._send(method, url, **kwargs)
+        if r.status_code == 304 and entry is not None:
+            return self._from_entry(cache.touch(key, entry))
+        if r.status_code == 200:
+            cache.store(key, r.status_code, r.headers, r.content, r.encoding, url)
+        return r
+
+    @staticmethod
+    def _from_entry(entry):
+        return AsyncResponse(entry['status_code'], entry['headers'], entry['content'], entry['encoding'])
+
+    async def _send(self, method, url, **kwargs):
+        session = self._get_session()
+        limiter = self.limiter or sync_transport.get_rate_limiter()
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            wait = limiter.reserve(host)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            async with session.request(method, url, **kwargs) as resp:
+                content = await resp.read()
+                r = AsyncResponse(resp.status, resp.headers, content, resp.charset)
+            limiter.feedback(host, r.status_code, sync_transport._retry_after(r.headers))
+            if not sync_transport._should_retry(r.status_code) or attempt == self.max_retries:
+                return r
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, data=None, **kwargs):
+        return await self.request('POST', url, data=data, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_transport = AsyncTransport()
+
+
+def get_transport():
+    return _transport
+
+
+def set_transport(transport):
+    '''
+    replace the transport used by the async readers (ex: a local fake in tests)
+    transport must provide coroutines get(url, **kwargs) and post(url, data=None, **kwargs)
+    '''
+    global _transport
+    previous, _transport = _transport, transport
+    return previous
+
+
+def configure(limit_per_host=8, limit=256, timeout=30, headers=None, max_retries=3):
+    '''
+    replace the default async transport with a new one (call close() on the previous one inside its loop)
+    rate limits are shared with the sync transport, see FinanceDataReader.transport.configure
+    '''
+    set_transport(AsyncTransport(limit_per_host, limit, timeout, headers, max_retries=max_retries))
+    return _transport
+
+
+async def get(url, **kwargs):
+    return await _transport.get(url, **kwargs)
+
+
+async def post(url, data=None, **kwargs):
+    return await _transport.post(url, data=data, **kwargs)
+
+
+async def close():
+    await _transport.close()
+
+
+async def _run_sync(func, *args):
+    # 브라우저 흉내(cloudscraper)가 필요한 소스는 동기 reader 를 스레드에서 실행
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+async def DataReader(symbol, start=None, end=None, exchange=None, data_source=None, timeframe='day'):
+    '''
+    async version of DataReader (same arguments, except the on-disk store)
+    investing.com symbols are read by the sync reader in a thread
+    '''
+    from FinanceDataReader import data
+    start, end = _validate_dates(start, end)
+
+    # FRED Reader
+    if data_source and data_source.upper() == 'FRED':
+        from FinanceDataReader.fred.data import (FredReader)
+        reader = FredReader(symbol, start, end, exchange, data_source)
+        r = await get(reader._url())
+        return reader._parse(r.content, r.headers['content-disposition'])
+
+    # KRX and Naver Finance
+    if data._is_krx_symbol(symbol, exchange):
+        from FinanceDataReader.naver.data import (NaverDailyReader, _parse_fchart)
+        reader = NaverDailyReader(symbol, start, end, exchange, data_source, timeframe=timeframe)
+        r = await get(reader._url(reader._bar_count(reader.start)))
+        return reader._postprocess(reader._frame(_parse_fchart(r.content)))
+
+    if timeframe != 'day':
+        raise NotImplementedError(f"timeframe='{timeframe}' is only supported for KRX symbols")
+
+    # KRX-DELISTING
+    if data._is_krx_delisting_symbol(symbol, exchange):
+        from FinanceDataReader.krx.data import (KrxDelistingReader)
+        reader = KrxDelistingReader(symbol, start, end, exchange, data_source)
+        codes = reader._locked_cached_full_codes()
+        if codes is None:
+            r = await post(reader.url, reader._finder_data(), headers=reader.headers)
+            codes = reader._locked_store_full_codes(r.text)
+        full_code = reader._full_code(codes)
+        r = await post(reader.url, reader._price_data(full_code), headers=reader.headers)
+        return reader._parse(r.text)
+
+    # Investing
+    return await _run_sync(data.DataReader, symbol, start, end, exchange, data_source)
+
+
+async def StockListing(market, date=None):
+    '''
+    async version of StockListing
+    ETF listings of investing.com are read by the sync reader in a thread
+    '''
+    market = market.upper()
+    if market in ['NASDAQ', 'NYSE', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE']:
+        from pandas import json_normalize
+        from FinanceDataReader.naver.listing import (NaverStockListing)
+        listing = NaverStockListing(market, None)
+        exchange = listing._exchange()
+        page_size = listing.page_size
+        jo = (await get(listing._page_url(exchange, 1, page_size), headers=listing.headers)).json()
+        pages = math.ceil(jo['totalCount'] / page_size)
+        rest = await asyncio.gather(*[
+            get(listing._page_url(exchange, page, page_size), headers=listing.headers) for page in range(2, pages + 1)])
+        records = list(jo['stocks'])
+        for r in rest:
+            records.extend(r.json()['stocks'])
+        return listing._rename(json_normalize(records))
+    if market in ['KRX', 'KOSPI', 'KOSDAQ', 'KONEX']:
+        from FinanceDataReader.krx.listing import (KrxStockListing)
+        listing = KrxStockListing(market, None)
+        df_master = listing._cached_master()
+        if df_master is None:
+            r_listing, r_finder = await asyncio.gather(
+                get(listing.kind_url, cache_ttl=listing.cache_ttl),
+                post(listing.finder_url, data=listing.finder_data, cache_ttl=listing.cache_ttl))
+            df_master = listing._store_master(
+                listing._merge(listing._parse_listing(r_listing.content), listing._parse_finder(r_finder.text)))
+        return listing._select_market(df_master)
+    if market in ['KRX-DELISTING']:
+        from FinanceDataReader.krx.listing import (KrxDelisting)
+        listing = KrxDelisting(market)
+        return listing._parse((await post(listing.url, listing.data, headers=listing.headers, cache_ttl=listing.cache_ttl)).text)
+    if market in ['KRX-MARCAP']:
+        from FinanceDataReader.krx.listing import (KrxMarcapListing)
+        listing = KrxMarcapListing(market)
+        if date is None:
+            date_str = listing._parse_date((await get(listing.date_url)).text)
+        else:
+            from pandas import to_datetime
+            date_str = to_datetime(date).strftime('%Y%m%d')
+        return listing._parse((await post(listing.url, listing._data(date_str))).text)
+    if market in ['KRX-ADMINISTRATIVE']:
+        from FinanceDataReader.krx.listing import (KrxAdministrative)
+        listing = KrxAdministrative(market)
+        return listing._parse((await get(listing.url, cache_ttl=listing.cache_ttl)).content)
+    if market in ['S&P500', 'SP500']:
+        from FinanceDataReader.wikipedia.listing import (WikipediaStockListing)
+        listing = WikipediaStockListing(market)
+        return listing._parse((await get(listing.url, cache_ttl=listing.cache_ttl)).content)
+    if market.startswith('ETF'):
+        toks = market.split('/')
+        etf, country = toks[0], toks[1]
+        if country.upper() == 'KR':
+            from FinanceDataReader.naver.listing import (NaverEtfListing)
+            listing = NaverEtfListing()
+            return listing._parse((await get(listing.url, cache_ttl=listing.cache_ttl)).text)
+        from FinanceDataReader.investing.listing import (InvestingEtfListing)
+        return await _run_sync(InvestingEtfListing(country).read)
+    else:
+        msg = "market='%s' is not implemented" % market
+        raise NotImplementedError(msg)
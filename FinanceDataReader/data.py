@@ -1,118 +1,205 @@
-from FinanceDataReader.investing.data import (InvestingDailyReader)
-from FinanceDataReader.fred.data import (FredReader)
-from FinanceDataReader.krx.data import (KrxDelistingReader)
-from FinanceDataReader.naver.data import (NaverDailyReader)
-from FinanceDataReader.nasdaq.listing import (NasdaqStockListing)
-from FinanceDataReader.krx.listing import (KrxStockListing, KrxDelisting, KrxMarcapListing, KrxAdministrative)
-from FinanceDataReader.wikipedia.listing import (WikipediaStockListing)
-from FinanceDataReader.investing.listing import (InvestingEtfListing)
-from FinanceDataReader.naver.listing import (NaverStockListing, NaverEtfListing)
-from FinanceDataReader._utils import (_convert_letter_to_num, _validate_dates)
-
-import re
+import warnings
 import pandas as pd
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from FinanceDataReader._utils import (_validate_dates, _to_panel, _compact)
 
+# reader 모듈은 무거운 의존성(selenium, cloudscraper, bs4 ...)을 가지므로 각 함수에서 필요할 때 import 한다
 
-def DataReader(symbol, start=None, end=None, exchange=None, data_source=None):
+
+def _is_krx_symbol(symbol, exchange):
+    return (symbol[:5].isdigit() and exchange == None) or \
+        (symbol[:5].isdigit() and exchange and exchange.upper() in ['KRX', '한국거래소'])
+
+
+def _is_krx_delisting_symbol(symbol, exchange):
+    return symbol[:5].isdigit() and exchange and exchange.upper() in ['KRX-DELISTING']
+
+
+def DataReader(symbol, start=None, end=None, exchange=None, data_source=None, cache_dir=None, refresh=False,
+               timeframe='day', compact=False):
     '''
     read price data from various exchanges or data source
     * symbol: code or ticker
     * start, end: date time string
     * exchange: 'KRX'(default), 'KRX-DELISTING', 'NYSE', 'NASDAQ', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE'
     * data_source: 'FRED' 
+    * cache_dir: directory of the on-disk price store (KRX, FRED), only new bars are downloaded after the first call
+    * refresh: ignore the stored prices and download the whole history again
+    * timeframe: 'day'(default), 'week', 'month', 'minute' (KRX only)
+    * compact: downcast the columns without losing values (int32 prices, float32, category strings) to save memory
     '''
+    df = _read_prices(symbol, start, end, exchange, data_source, cache_dir, refresh, timeframe)
+    return _compact(df) if compact else df
+
+
+def _read_prices(symbol, start, end, exchange, data_source, cache_dir, refresh, timeframe):
     start, end = _validate_dates(start, end)
 
     # FRED Reader
     if data_source and data_source.upper() == 'FRED':
-        return FredReader(symbol, start, end, exchange, data_source).read()
+        from FinanceDataReader.fred.data import (FredReader)
+        return FredReader(symbol, start, end, exchange, data_source, cache_dir, refresh).read()
 
     # KRX and Naver Finance
-    if (symbol[:5].isdigit() and exchange == None) or \
-            (symbol[:5].isdigit() and exchange and exchange.upper() in ['KRX', '한국거래소']):
-        return NaverDailyReader(symbol, start, end, exchange, data_source).read()
+    if _is_krx_symbol(symbol, exchange):
+        from FinanceDataReader.naver.data import (NaverDailyReader)
+        return NaverDailyReader(symbol, start, end, exchange, data_source, cache_dir, refresh, timeframe).read()
+
+    if timeframe != 'day':
+        raise NotImplementedError(f"timeframe='{timeframe}' is only supported for KRX symbols")
 
     # KRX-DELISTING
-    if (symbol[:5].isdigit() and exchange and exchange.upper() in ['KRX-DELISTING']):
+    if _is_krx_delisting_symbol(symbol, exchange):
+        from FinanceDataReader.krx.data import (KrxDelistingReader)
         return KrxDelistingReader(symbol, start, end, exchange, data_source).read()
 
-    # Investing
-    reader = InvestingDailyReader
-    df = reader(symbol, start, end, exchange, data_source).read()
-    end = min([pd.to_datetime(end), datetime.today()])
-    while len(df) and df.index[-1] < end:  # issues/30
-        more = reader(symbol, df.index[-1] + timedelta(1), end, exchange, data_source).read()
-        if len(more) == 0:
-            break
-        df = pd.concat([df, more])
+    # Investing (응답이 기간의 일부만 담는 경우(issues/30)는 reader 가 남은 기간을 이어서 요청)
+    from FinanceDataReader.investing.data import (InvestingDailyReader)
+    return InvestingDailyReader(symbol, start, end, exchange, data_source).read()
+
+
+def _date_indexed(df):
+    # Date 를 컬럼으로 주는 reader(KRX-DELISTING)의 결과는 Date 인덱스로 바꾸어 날짜순 정렬
+    if not isinstance(df.index, pd.DatetimeIndex) and 'Date' in df.columns:
+        df = df.set_index('Date').sort_index()
     return df
 
 
-def StockListing(market):
+def DataReaderMany(symbols, start=None, end=None, exchange=None, data_source=None, max_workers=8, output='dict',
+                   cache_dir=None, refresh=False, timeframe='day', fields=None, compact=False):
+    '''
+    read price data of multiple symbols concurrently
+    * symbols: list of codes or tickers
+    * start, end, exchange, data_source, cache_dir, refresh, timeframe: same as DataReader
+    * max_workers: number of threads fetching at the same time
+    * output: 'dict'(default) {symbol: DataFrame}, 'long' DataFrame indexed by (Symbol, Date),
+              'panel' {field: DataFrame} of aligned Date x Symbol matrices
+    * fields: fields built by output='panel' (default: 'Open', 'High', 'Low', 'Close', 'Volume', 'Change')
+    * compact: same as DataReader (the matrices of output='panel' are downcast too)
+    symbols failed to read are reported with a warning and left out of the result
+    requests are rate limited per host (KRX prices: 30 requests/s, see transport.RateLimiter.default_host_rates),
+    change the limit with fdr.transport.set_rate_limit(host, rate)
+    every frame is indexed by Date, including the sources returning Date as a column (KRX-DELISTING)
+    '''
+    if output not in ['dict', 'long', 'panel']:
+        raise ValueError(f"output='{output}' is not supported. use 'dict', 'long' or 'panel'")
+    symbols = list(dict.fromkeys(symbols))  # 중복 제거, 순서 유지
+
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(DataReader, sym, start, end, exchange, data_source, cache_dir, refresh, timeframe,
+                            compact): sym
+            for sym in symbols
+        }
+        for future in as_completed(futures):
+            sym = futures[future]
+            try:
+                results[sym] = future.result()
+            except Exception as e:
+                errors[sym] = e
+    if errors:
+        msg = ', '.join(f'{sym}({type(e).__name__}: {e})' for sym, e in errors.items())
+        warnings.warn(f'{len(errors)} of {len(symbols)} symbols failed: {msg}')
+
+    frames = {sym: _date_indexed(results[sym]) for sym in symbols if sym in results}
+    if output == 'panel':
+        panel = _to_panel(frames, fields)
+        return {field: _compact(df) for field, df in panel.items()} if compact else panel
+    if output == 'long':
+        if not len(frames):
+            return pd.DataFrame()
+        return pd.concat(frames, names=['Symbol', 'Date'])
+    return frames
+
+
+def StockListing(market, date=None, compact=False):
     '''
     read stock list of stock exchanges
     * market: 'S&P500', 'NASDAQ', 'NYSE', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE',
             'KRX', 'KOSPI', 'KOSDAQ', 'KONEX'
             'KRX-DELISTING', 'KRX-MARCAP', 'KRX-ADMINISTRATIVE'
             'ETF/KR'
+    * date: trading day of 'KRX-MARCAP' (default: the latest trading day)
+    * compact: downcast the columns without losing values (Market, Sector ... as category) to save memory
     '''
-    market = market.upper()
+    df = _read_listing(market.upper(), date)
+    return _compact(df) if compact else df
+
+
+def _read_listing(market, date):
     if market in ['NASDAQ', 'NYSE', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE']:
+        from FinanceDataReader.naver.listing import (NaverStockListing)
         return NaverStockListing(market, DataReader).read()
     if market in ['KRX', 'KOSPI', 'KOSDAQ', 'KONEX']:
+        from FinanceDataReader.krx.listing import (KrxStockListing)
         return KrxStockListing(market, DataReader).read()
     if market in ['KRX-DELISTING']:
+        from FinanceDataReader.krx.listing import (KrxDelisting)
         return KrxDelisting(market).read()
     if market in ['KRX-MARCAP']:
-        return KrxMarcapListing(market).read()
+        from FinanceDataReader.krx.listing import (KrxMarcapListing)
+        return KrxMarcapListing(market).read(date)
     if market in ['KRX-ADMINISTRATIVE']:
+        from FinanceDataReader.krx.listing import (KrxAdministrative)
         return KrxAdministrative(market).read()
     if market in ['S&P500', 'SP500']:
+        from FinanceDataReader.wikipedia.listing import (WikipediaStockListing)
         return WikipediaStockListing(market).read()
     if market.startswith('ETF'):
         toks = market.split('/')
         etf, country = toks[0], toks[1]
         if country.upper() == 'KR':
+            from FinanceDataReader.naver.listing import (NaverEtfListing)
             return NaverEtfListing().read()
+        from FinanceDataReader.investing.listing import (InvestingEtfListing)
         return InvestingEtfListing(country).read()
     else:
         msg = "market='%s' is not implemented" % market
         raise NotImplementedError(msg)
 
 
-def StockListingAll(market):
+def StockListingHistory(market, start, end=None, max_workers=8):
     '''
-    read stock list of stock exchanges
+    read the stock list of every trading day of a period at once (cross-sectional history)
+    * market: 'KRX-MARCAP'
+    * start, end: period (end default: today)
+    * max_workers: number of days requested at the same time
+    return DataFrame indexed by (Date, Code): OHLCV, market cap and number of shares of every issue
+    '''
+    market = market.upper()
+    if market in ['KRX-MARCAP']:
+        from FinanceDataReader.krx.listing import (KrxMarcapListing)
+        return KrxMarcapListing(market).read_range(start, end, max_workers)
+    msg = "market='%s' is not implemented" % market
+    raise NotImplementedError(msg)
+
+
+def StockListingAll(market, chromedriver=None, max_workers=8, limit=None, compact=False):
+    '''
+    read stock list of stock exchanges, with the fundamentals of each stock (KRX, NASDAQ ...)
     * market: 'S&P500', 'NASDAQ', 'NYSE', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE',
             'KRX', 'KOSPI', 'KOSDAQ', 'KONEX'
             'KRX-DELISTING', 'KRX-MARCAP', 'KRX-ADMINISTRATIVE'
             'ETF/KR'
+    * chromedriver: path of chromedriver, selenium fallback for the KRX fundamentals (wisereport)
+    * max_workers: number of symbols whose fundamentals are fetched at the same time
+    * limit: read fundamentals of the first `limit` symbols only (None: all)
+    * compact: same as StockListing
     '''
     market = market.upper()
     if market in ['NASDAQ', 'NYSE', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE']:
         print(f'{market}에 대한 crawling 을 시작합니다.')
-        return NaverStockListing(market, DataReader).read_all()
-    if market in ['KRX', 'KOSPI', 'KOSDAQ', 'KONEX']:
+        from FinanceDataReader.naver.listing import (NaverStockListing)
+        df = NaverStockListing(market, DataReader).read_all(max_workers, limit)
+    elif market in ['KRX', 'KOSPI', 'KOSDAQ', 'KONEX']:
         print(f'{market}에 대한 crawling 을 시작합니다.')
-        return KrxStockListing(market, DataReader).read_all()
-    if market in ['KRX-DELISTING']:
-        return KrxDelisting(market).read()
-    if market in ['KRX-MARCAP']:
-        return KrxMarcapListing(market).read()
-    if market in ['KRX-ADMINISTRATIVE']:
-        return KrxAdministrative(market).read()
-    if market in ['S&P500', 'SP500']:
-        return WikipediaStockListing(market).read()
-    if market.startswith('ETF'):
-        toks = market.split('/')
-        etf, country = toks[0], toks[1]
-        if country.upper() == 'KR':
-            return NaverEtfListing().read()
-        return InvestingEtfListing(country).read()
+        from FinanceDataReader.krx.listing import (KrxStockListing)
+        df = KrxStockListing(market, DataReader, chromedriver).read_all(max_workers, limit)
     else:
-        msg = "market='%s' is not implemented" % market
-        raise NotImplementedError(msg)
+        # 나머지 시장은 StockListing 과 같음
+        df = _read_listing(market, None)
+    return _compact(df) if compact else df
 
 
 def EtfListing(country='KR'):
@@ -122,5 +209,7 @@ def EtfListing(country='KR'):
     # Deprecation warnings
     print('EtfListing() will deprecated. Use fdr.StockListing("ETF/KR") instead of fdr.EtfListing("KR")')
     if country.upper() == 'KR':
+        from FinanceDataReader.naver.listing import (NaverEtfListing)
         return NaverEtfListing().read()
+    from FinanceDataReader.investing.listing import (InvestingEtfListing)
     return InvestingEtfListing(country).read()
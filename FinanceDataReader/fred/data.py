@@ -1,48 +1,122 @@
 import pandas as pd
-import numpy as np
-import requests
 from datetime import datetime
 import re
 from io import BytesIO
 import zipfile
-from FinanceDataReader._utils import (_convert_letter_to_num, _validate_dates)
+from concurrent.futures import ThreadPoolExecutor
+from FinanceDataReader._utils import (_validate_dates, _filter_by_date)
+from FinanceDataReader._store import ColumnarStore
+from FinanceDataReader import transport
+
+
+def _read_series_csv(data):
+    # fredgraph.csv: 첫 컬럼은 날짜('DATE' 또는 'observation_date'), 나머지는 시리즈, 결측은 '.'
+    return pd.read_csv(BytesIO(data), index_col=0, parse_dates=True, na_values='.')
+
 
 class FredReader:
-    def __init__(self, symbol, start=None, end=None, exchange=None, data_source=None):
+    history_start = datetime(1776, 7, 4)  # 저장소를 처음 채울 때 요청하는 시작일 (FRED 의 기본값)
+    batch_size = 50  # 한번에 요청하는 시리즈 수 (URL 길이 제한)
+    max_workers = 4
+
+    def __init__(self, symbol, start=None, end=None, exchange=None, data_source=None, cache_dir=None, refresh=False):
+        '''
+        * symbol: series ID or list of series IDs
+        * cache_dir: 지정하면 시리즈별로 디스크에 저장하고, 이후에는 마지막 관측일 이후의 데이터만 받아서 추가
+        * refresh: True 이면 저장된 데이터를 무시하고 전체 데이터를 다시 받아서 저장
+        '''
         self.symbol = symbol
         start, end = _validate_dates(start, end)
         self.start = start
         self.end = end
         self.data_source = data_source
+        self.store = ColumnarStore(cache_dir, 'fred') if cache_dir else None
+        self.refresh = refresh
 
-    def read(self):
-        if type(self.symbol)==list:
-            start_str = ','.join([self.start.strftime("%Y-%m-%d")] * len(self.symbol))
-            end_str = ','.join([self.end.strftime("%Y-%m-%d")] * len(self.symbol))
-            sym = ','.join(self.symbol)
-        else:
-            start_str = self.start.strftime("%Y-%m-%d")
-            end_str = self.end.strftime("%Y-%m-%d")
-            sym = self.symbol
-
-        url = f'https://fred.stlouisfed.org/graph/fredgraph.csv?id={sym}&cosd={start_str}&coed={end_str}'
-        r = requests.get(url)
-        fname = re.findall('filename="(.+)"', r.headers['content-disposition'])[0]
-        if fname=='fredgraph.zip':
-            df_list = []
-            with zipfile.ZipFile(BytesIO(r.content)) as zf:
-                for zfn in zf.namelist():
-                    df = pd.read_csv(zf.open(zfn), parse_dates=['DATE'], na_values='.')
-                    df.set_index('DATE', inplace=True)
-                    df.replace('.', '', inplace=True)
-                    df_list.append(df)
-            merged = pd.concat(df_list, axis=1)
-            merged.fillna(method='ffill', inplace=True)
-            return merged
+    def _symbols(self):
+        return list(self.symbol) if type(self.symbol) == list else [self.symbol]
+
+    def _url(self, symbols=None, starts=None, end=None):
+        '''
+        one request for many series, each from its own start (cosd) to end (coed)
+        '''
+        symbols = symbols or self._symbols()
+        starts = starts or [self.start] * len(symbols)
+        end = end or self.end
+        start_str = ','.join([pd.Timestamp(start).strftime("%Y-%m-%d") for start in starts])
+        end_str = ','.join([end.strftime("%Y-%m-%d")] * len(symbols))
+        sym = ','.join(symbols)
+        return f'https://fred.stlouisfed.org/graph/fredgraph.csv?id={sym}&cosd={start_str}&coed={end_str}'
 
+    @staticmethod
+    def _parse_series(content, content_disposition):
+        '''
+        :return: {series ID (upper case): Series} of the csv, or of every csv of the zip decoded in parallel
+        '''
+        fname = re.findall('filename="(.+)"', content_disposition)[0]
+        if fname == 'fredgraph.zip':
+            with zipfile.ZipFile(BytesIO(content)) as zf:
+                members = [zf.read(zfn) for zfn in zf.namelist()]
+            with ThreadPoolExecutor() as executor:
+                dfs = list(executor.map(_read_series_csv, members))
         elif '.csv' in fname:
-            df = pd.read_csv(url, parse_dates=['DATE'], na_values='.')
-            df.set_index('DATE', inplace=True)
-            df.replace('.', '', inplace=True)
-            df.fillna(method='ffill', inplace=True)
-            return df
+            dfs = [_read_series_csv(content)]
+        else:
+            return {}
+        return {str(col).upper(): df[col] for df in dfs for col in df.columns}
+
+    def _frame(self, series):
+        # 요청한 순서로 한번에 정렬(align)하고 기간을 자른 뒤 결측값은 직전 값으로 채움
+        cols = [series[sym.upper()] for sym in self._symbols() if sym.upper() in series]
+        if not len(cols):
+            return pd.DataFrame()
+        merged = pd.concat(cols, axis=1, sort=True)
+        merged.index.name = 'DATE'
+        return _filter_by_date(merged, self.start, self.end).ffill()
+
+    def _parse(self, content, content_disposition):
+        return self._frame(self._parse_series(content, content_disposition))
+
+    def _fetch(self, symbols, starts, end):
+        r = transport.get(self._url(symbols, starts, end))
+        return self._parse_series(r.content, r.headers['content-disposition'])
+
+    def _fetch_many(self, symbols, starts, end):
+        batches = [(symbols[i:i + self.batch_size], starts[i:i + self.batch_size])
+                   for i in range(0, len(symbols), self.batch_size)]
+        series = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for result in executor.map(lambda batch: self._fetch(*batch, end), batches):
+                series.update(result)
+        return series
+
+    def _read_stored(self, symbols):
+        # 저장된 시리즈는 마지막 관측일(수정될 수 있으므로 다시 받음)부터, 없는 시리즈는 처음부터 오늘까지
+        stored = {sym: None if self.refresh else self.store.load(sym) for sym in symbols}
+        starts = [stored[sym].index[-1] if stored[sym] is not None and len(stored[sym]) else self.history_start
+                  for sym in symbols]
+        new = self._fetch_many(symbols, starts, datetime.today())
+
+        series = {}
+        for sym in symbols:
+            key = sym.upper()
+            old = stored[sym] if stored[sym] is not None and len(stored[sym]) else None
+            # 여러 시리즈를 한번에 받으면 날짜가 합쳐지므로 각 시리즈의 관측값만 저장
+            if key in new and new[key].notna().any():
+                frame = new[key].dropna().to_frame()
+                if old is None:
+                    self.store.save(sym, frame)
+                else:
+                    frame = self.store.append(sym, frame)
+                series[key] = frame.iloc[:, 0]
+            elif old is not None:
+                series[key] = old.iloc[:, 0]
+        return series
+
+    def read(self):
+        symbols = self._symbols()
+        if self.store is None:
+            series = self._fetch_many(symbols, [self.start] * len(symbols), self.end)
+        else:
+            series = self._read_stored(symbols)
+        return self._frame(series)
@@ -1,13 +1,26 @@
-from io import StringIO
-from datetime import timedelta
+import os
+import json
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import requests
 import pandas as pd
-from FinanceDataReader._utils import (_convert_letter_to_num, _validate_dates)
-from bs4 import BeautifulSoup
-import cloudscraper
-import re
+from FinanceDataReader._utils import (_convert_letter_to_num_series, _validate_dates, _default_cache_dir)
+from FinanceDataReader import transport
+
 
 class InvestingDailyReader:
+    cache_dir = None  # pair ID 를 저장할 디렉토리 (None: _default_cache_dir())
+    window_days = 5 * 365  # 긴 기간은 이 길이의 구간으로 나누어 동시에 요청
+    max_workers = 4
+    max_pages = 100  # 한 구간에서 요청하는 최대 페이지 수
+    gap_days = 4  # 받은 데이터의 앞뒤로 이보다 긴 빈 기간이 남으면 그 기간을 다시 요청 (연휴보다 길게)
+
+    # (symbol, exchange) -> pair ID, 프로세스 내에서 공유하고 디스크에 저장 (pair ID 는 바뀌지 않음)
+    _currid_cache = {}
+    _currid_loaded = False
+    _currid_lock = threading.Lock()
 
     def __init__(self, symbol, start=None, end=None, exchange=None, data_source=None):
         self.symbol = symbol
@@ -17,11 +30,49 @@ class InvestingDailyReader:
         self.exchange = exchange
         self.data_source = data_source
 
+    @classmethod
+    def _currid_file(cls):
+        return os.path.join(cls.cache_dir or _default_cache_dir(), 'investing', 'pair_ids.json')
+
+    @classmethod
+    def _load_currids(cls):
+        # 처음 사용할 때 한번 디스크에서 읽음 (_currid_lock 안에서 호출)
+        if cls._currid_loaded:
+            return
+        cls._currid_loaded = True
+        try:
+            with open(cls._currid_file(), encoding='utf-8') as f:
+                cls._currid_cache.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def _save_currids(cls):
+        fn = cls._currid_file()
+        try:
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            tmp = f'{fn}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(cls._currid_cache, f)
+            os.replace(tmp, fn)
+        except OSError:
+            pass  # 디스크에 저장하지 못해도 메모리의 값은 사용
+
     def _get_currid_investing(self, symbol, exchange=None):
+        key = f"{symbol.upper()}|{exchange.upper() if exchange else ''}"
+        with self._currid_lock:
+            self._load_currids()
+            if key in self._currid_cache:
+                return self._currid_cache[key]
+        curr_id = int(self._search_currid_investing(symbol, exchange))
+        with self._currid_lock:
+            self._currid_cache[key] = curr_id
+            self._save_currids()
+        return curr_id
+
+    def _search_currid_investing(self, symbol, exchange=None):
         url = f'https://api.investing.com/api/search/v2/search?q={symbol}'
-        scraper = cloudscraper.create_scraper(
-            browser={'browser': 'firefox', 'platform': 'windows', 'mobile': False})
-        r = scraper.get(url, headers={'user-agent':'Mozilla/5.0', 'domain-id': 'en', 'dnt': '1'})
+        r = transport.get(url, browser='firefox', headers={'user-agent':'Mozilla/5.0', 'domain-id': 'en', 'dnt': '1'})
         jo = r.json()
         # r = requests.get(url, headers={'user-agent':'Mozilla/5.0', 'domain-id': 'en', 'dnt': '1'})
         # jo = r.json()
@@ -51,55 +102,86 @@ class InvestingDailyReader:
             raise ValueError(f"Symbol('{symbol}'), Exchange('{exchange}') not found")
         return df.iloc[0]['id']
 
+    def _fetch_page(self, curr_id, start, end):
+        url = 'https://iappapi.investing.com/get_screen.php?' \
+                f'lang_ID=51&skinID=2&interval=day&time_utc_offset=7200&screen_ID=63&' \
+                f'pair_ID={curr_id}&date_from={start.strftime("%d%m%Y")}&date_to={end.strftime("%d%m%Y")}'
+        r = None
+        for n in range(5): # retry (429, 5xx 는 transport 의 rate limiter 가 기다렸다가 재시도)
+            try:
+                r = transport.get(url, browser='firefox', headers={ 'X-Meta-Ver': '14', 'User-Agent': 'Mozilla/5.0' }, timeout=3)
+                break
+            except requests.exceptions.Timeout:
+                print(f'timeout (retries: {n+1})')
+                time.sleep(2)
+        if r is None:
+            raise requests.exceptions.Timeout(f'investing.com did not respond: {url}')
+        try:
+            jo = r.json()
+        except json.decoder.JSONDecodeError as e:
+            print(e); print('-' * 128); print(r.text)
+            raise
+
+        df = pd.DataFrame(jo['data'][0]['screen_data']['data'])
+        if len(df):
+            df['date'] = pd.to_datetime(df['date'], unit='s')
+        return df
+
+    def _read_window(self, curr_id, start, end):
+        # 응답은 요청 기간의 일부만 담을 수 있으므로, 받은 데이터의 앞뒤로 남은 기간을 이어서 요청
+        frames = []
+        ranges = [(start, end)]
+        for x in range(self.max_pages):
+            if not ranges:
+                break
+            lo, hi = ranges.pop()
+            df = self._fetch_page(curr_id, lo, hi)
+            if not len(df):
+                continue
+            frames.append(df)
+            first, last = df['date'].min().normalize(), df['date'].max().normalize()
+            if (first - lo).days > self.gap_days:
+                ranges.append((lo, first - timedelta(1)))
+            if (hi - last).days > self.gap_days:
+                ranges.append((last + timedelta(1), hi))
+        return frames
+
+    def _windows(self, start, end):
+        windows = []
+        while start <= end:
+            stop = min(start + timedelta(self.window_days - 1), end)
+            windows.append((start, stop))
+            start = stop + timedelta(1)
+        return windows
+
     def read(self):
-        start = pd.to_datetime(self.start) if self.start  else pd.to_datetime('2022-01-01')
-        end = pd.to_datetime(self.end) if self.end  else datetime.today()
+        start = pd.to_datetime(self.start).normalize()
+        end = pd.to_datetime(min(pd.to_datetime(self.end), datetime.today())).normalize()
 
         curr_id = self._get_currid_investing(self.symbol, self.exchange)
         if not curr_id:
             raise ValueError("Symbol unsupported or not found")
 
-        merged = pd.DataFrame()
-        for x in range(100):
-            url = 'https://iappapi.investing.com/get_screen.php?' \
-                    f'lang_ID=51&skinID=2&interval=day&time_utc_offset=7200&screen_ID=63&' \
-                    f'pair_ID={curr_id}&date_from={start.strftime("%d%m%Y")}&date_to={end.strftime("%d%m%Y")}'
-            for n in range(5): # retry
-                try:
-                    scraper = cloudscraper.create_scraper(
-                        browser={'browser': 'firefox', 'platform': 'windows', 'mobile': False})
-                    r = scraper.get(url, headers={ 'X-Meta-Ver': '14', 'User-Agent': 'Mozilla/5.0' }, timeout=3)
-                    # r = requests.get(url, headers={ 'X-Meta-Ver': '14', 'User-Agent': 'Mozilla/5.0' }, timeout=3)
-                except requests.exceptions.Timeout:
-                    print(f'timeout (retries: {n+1})')
-                    time.sleep(2)
-                    continue
-            try:
-                jo = r.json()
-            except json.decoder.JSONDecodeError as e:
-                print(e); print('-' * 128); print(r.text)
-
-            df = pd.DataFrame(jo['data'][0]['screen_data']['data'])
-            if not len(df):
-                break
-            df['date'] = pd.to_datetime(df['date'], unit='s')
-            merged = pd.concat([merged, df]) 
-            if df.iloc[-1]['date'] <= start:
-                break
-            end = df.iloc[-1]['date'] - timedelta(1)
+        windows = self._windows(start, end)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = [df for dfs in executor.map(lambda w: self._read_window(curr_id, *w), windows) for df in dfs]
+        if not len(frames):
+            return pd.DataFrame()
+        merged = pd.concat(frames)
+        merged = merged.drop_duplicates('date')
+        return self._parse(merged)
 
-        if len(merged) <= 0:
-            return merged # empty
+    @staticmethod
+    def _parse(merged):
         cols_dict = {'date':'Date', 'price': 'Close', 'open':'Open', 'high':'High', 'low': 'Low', 'vol': 'Volume', 'perc_chg': 'Change'}
         merged = merged.rename(columns=cols_dict)
-        merged = merged[['Date', 'Close', 'Open', 'High', 'Low', 'Volume', 'Change']]
+        merged = merged[['Date', 'Close', 'Open', 'High', 'Low', 'Volume', 'Change']].copy()
         merged['Open'] = merged['Open'].str.replace(',', '').astype('float')
         merged['High'] = merged['High'].str.replace(',', '').astype('float')
         merged['Low'] = merged['Low'].str.replace(',', '').astype('float')
         merged['Close'] = merged['Close'].str.replace(',', '').astype('float')
-        merged['Volume'] = merged['Volume'].apply(_convert_letter_to_num)
+        merged['Volume'] = _convert_letter_to_num_series(merged['Volume'])
         merged['Change'] = merged['Change'].str.replace(',', '').str.rstrip('%').astype('float') / 100.0
-        merged = merged.sort_index()
 
         merged.set_index('Date', inplace=True)
         merged.sort_index(inplace=True)
@@ -1,9 +1,8 @@
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
-import cloudscraper
 import re
 from FinanceDataReader._utils import (_convert_letter_to_num, _validate_dates)
+from FinanceDataReader import transport
 
 
 class InvestingEtfListing:
@@ -33,12 +32,7 @@ class InvestingEtfListing:
             url += '?&asset=2&issuer_filter=0'
         succeed = False
         while not succeed:
-            scraper = cloudscraper.create_scraper(browser={
-                'browser': 'firefox',
-                'platform': 'windows',
-                'mobile': False
-            })
-            html = scraper.get(url).content
+            html = transport.get(url, browser='firefox').content
             soup = BeautifulSoup(html, 'html.parser')
 
             # r = requests.get(url, headers=headers)
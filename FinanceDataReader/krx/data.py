@@ -1,31 +1,116 @@
-import requests
+import os
 import json
+import threading
 import pandas as pd
-from io import BytesIO
 from datetime import datetime
+from FinanceDataReader import transport
+from FinanceDataReader._utils import _default_cache_dir
+
 
 class KrxDelistingReader:
+    url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+    headers = {'User-Agent': 'Chrome/78.0.3904.87 Safari/537.36',}
+    cache_dir = None  # short_code -> full_code 맵을 저장할 디렉토리 (None: _default_cache_dir())
+
+    # 상장, 상장폐지 전 종목의 short_code -> full_code 맵, 프로세스 내에서 공유하고 하루에 한번 새로 받음
+    _full_codes = {'date': None, 'codes': {}}
+    _full_codes_lock = threading.Lock()
+
     def __init__(self, symbol, start=None, end=None, exchange=None, data_source=None):
         self.symbol = symbol
         self.start = datetime(1990,1,1) if start==None else pd.to_datetime(start)
         self.end = datetime(2100,1,1) if end==None else pd.to_datetime(end)
 
-    def read(self):
-        headers = {'User-Agent': 'Chrome/78.0.3904.87 Safari/537.36',}
-        data = {
+    @staticmethod
+    def _finder_data():
+        return {
             'mktsel': 'ALL',
             'searchText': '',
             'bld': 'dbms/comm/finder/finder_listdelisu',
         }
 
-        url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
-        r = requests.post(url, data, headers=headers)
-        j = json.loads(r.text)
-        df = pd.json_normalize(j['block1'])
-        df = df.set_index('short_code')
-        full_code = df.loc[self.symbol]['full_code']
+    @classmethod
+    def _full_codes_file(cls):
+        return os.path.join(cls.cache_dir or _default_cache_dir(), 'krx', 'delisting_full_codes.json')
+
+    @classmethod
+    def _cached_full_codes(cls):
+        '''
+        short_code -> full_code map of today from memory or disk, None when it has to be downloaded
+        '''
+        today = datetime.today().strftime('%Y%m%d')
+        if cls._full_codes['date'] == today:
+            return cls._full_codes['codes']
+        try:
+            with open(cls._full_codes_file(), encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if stored.get('date') != today:
+            return None
+        cls._full_codes = stored
+        return stored['codes']
+
+    @classmethod
+    def _store_full_codes(cls, text):
+        # 종목검색 응답(전 종목)에서 맵을 만들어 메모리와 디스크에 저장
+        codes = {item['short_code']: item['full_code'] for item in json.loads(text)['block1']}
+        cls._full_codes = {'date': datetime.today().strftime('%Y%m%d'), 'codes': codes}
+        fn = cls._full_codes_file()
+        try:
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            tmp = f'{fn}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(cls._full_codes, f)
+            os.replace(tmp, fn)
+        except OSError:
+            pass  # 디스크에 저장하지 못해도 메모리의 맵은 사용
+        return codes
+
+    @classmethod
+    def full_codes(cls):
+        '''
+        short_code -> full_code map of every listed and delisted issue (downloaded at most once a day)
+        '''
+        with cls._full_codes_lock:
+            codes = cls._cached_full_codes()
+            if codes is None:
+                r = transport.post(cls.url, cls._finder_data(), headers=cls.headers)
+                codes = cls._store_full_codes(r.text)
+            return codes
+
+    @classmethod
+    def _locked_cached_full_codes(cls):
+        # 비동기 reader 용: 맵을 받는 동안 lock 을 잡고 있을 수 없으므로 조회와 저장을 각각 lock 안에서
+        with cls._full_codes_lock:
+            return cls._cached_full_codes()
 
-        data = {
+    @classmethod
+    def _locked_store_full_codes(cls, text):
+        '''
+        store the map of a finder response downloaded outside the lock (async reader),
+        the map of today stored by another thread meanwhile is kept
+        '''
+        with cls._full_codes_lock:
+            codes = cls._cached_full_codes()
+            return codes if codes is not None else cls._store_full_codes(text)
+
+    @classmethod
+    def resolve(cls, symbols):
+        '''
+        full_code of many symbols from one map load: {symbol: full_code or None}
+        '''
+        codes = cls.full_codes()
+        return {symbol: codes.get(symbol) for symbol in symbols}
+
+    def _full_code(self, codes):
+        try:
+            return codes[self.symbol]
+        except KeyError:
+            raise ValueError(f'Symbol "{self.symbol}" not found in KRX issues')
+
+    def _price_data(self, full_code):
+        return {
             'bld': 'dbms/MDC/STAT/issue/MDCSTAT23902',
             'isuCd': full_code,
             'isuCd2': '',
@@ -36,26 +121,31 @@ class KrxDelistingReader:
             'csvxls_isNo': 'false',
         }
 
-        url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
-        r = requests.post(url, data, headers=headers)
-        j = json.loads(r.text)
+    def _parse(self, text):
+        j = json.loads(text)
         df = pd.json_normalize(j['output'])
-        col_map = {'TRD_DD':'Date', 'ISU_CD':'Code', 'ISU_NM':'Name', 'MKT_NM':'Market', 
-                   'SECUGRP_NM':'SecuGroup', 'TDD_CLSPRC':'Close', 'FLUC_TP_CD':'UpDown', 
-                   'CMPPRVDD_PRC':'Change', 'FLUC_RT':'ChangeRate', 
-                   'TDD_OPNPRC':'Open', 'TDD_HGPRC':'High', 'TDD_LWPRC':'Lower', 
+        col_map = {'TRD_DD':'Date', 'ISU_CD':'Code', 'ISU_NM':'Name', 'MKT_NM':'Market',
+                   'SECUGRP_NM':'SecuGroup', 'TDD_CLSPRC':'Close', 'FLUC_TP_CD':'UpDown',
+                   'CMPPRVDD_PRC':'Change', 'FLUC_RT':'ChangeRate',
+                   'TDD_OPNPRC':'Open', 'TDD_HGPRC':'High', 'TDD_LWPRC':'Lower',
                    'ACC_TRDVOL':'Volume', 'ACC_TRDVAL':'Amount', 'MKTCAP':'MarCap'}
 
         df = df.rename(columns=col_map)
         df['Date'] = pd.to_datetime(df['Date'])
         int_cols = ['Close', 'UpDown', 'Change', 'Open', 'High', 'Lower', 'Volume', 'Amount', 'MarCap']
-        for col in int_cols: 
+        for col in int_cols:
             df[col] = pd.to_numeric(df[col].str.replace(',', ''), errors='coerce')
-        
+
         # df['ChangeRate'] = pd.to_numeric(df['ChangeRate'])
         #### to deal with parse string error such as < ValueError: Unable to parse string "2,946.15" >
         from pandas.api.types import is_string_dtype
         if is_string_dtype(df['ChangeRate']):
             df['ChangeRate'] = pd.to_numeric(df['ChangeRate'].str.replace(',', ''), errors='coerce')
-        
+
         return df
+
+    def read(self):
+        full_code = self._full_code(self.full_codes())
+
+        r = transport.post(self.url, self._price_data(full_code), headers=self.headers)
+        return self._parse(r.text)
@@ -1,16 +1,16 @@
 import io
 import time
+import threading
 import datetime
 from datetime import timedelta
-import requests
-from bs4 import BeautifulSoup
+from FinanceDataReader import transport
 import numpy as np
 import pandas as pd
 import json
 import ssl
 import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
+from FinanceDataReader._utils import (_monthly_return_volatility, _map_symbols)
+from FinanceDataReader.trading_calendar import get_calendar
 
 try:
     from pandas import json_normalize
@@ -18,18 +18,37 @@ except ImportError:
     from pandas.io.json import json_normalize
 
 
+def _to_float(cells, i):
+    try:
+        return float(str(cells[i]).replace(',', ''))
+    except (IndexError, ValueError):
+        return 0.
+
+
 class KrxStockListing:
-    def __init__(self, market, DataReader):
+    kind_url = 'http://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13'
+    finder_url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+    finder_data = {
+        'bld': 'dbms/comm/finder/finder_stkisu',
+    }
+    cache_ttl = 12 * 3600  # 상장회사목록, 종목검색은 하루에 한번 정도 바뀜
+
+    # 상장회사목록과 종목검색을 병합한 KRX 전체 종목(master), KRX/KOSPI/KOSDAQ/KONEX, read/read_all 이 공유
+    _master = {'time': None, 'df': None}
+    _master_lock = threading.Lock()
+
+    def __init__(self, market, DataReader, chromedriver=None):
+        '''
+        * chromedriver: path of chromedriver, used by read_all only when wisereport can not be read over plain HTTP
+        '''
         self.market = market
         self.DataReader = DataReader
+        self.chromedriver = chromedriver
 
-    def read(self):
+    @staticmethod
+    def _parse_listing(content):
         # KRX 상장회사목록
-        # For mac, SSL CERTIFICATION VERIFICATION ERROR
-        ssl._create_default_https_context = ssl._create_unverified_context
-
-        url = 'http://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13'
-        df_listing = pd.read_html(url, header=0, flavor='bs4', encoding='EUC-KR')[0]
+        df_listing = pd.read_html(io.BytesIO(content), header=0, flavor='lxml', encoding='EUC-KR')[0]
         cols_ren = {
             '회사명': 'Name',
             '종목코드': 'Symbol',
@@ -42,16 +61,14 @@ class KrxStockListing:
             '지역': 'Region',
         }
         df_listing = df_listing.rename(columns=cols_ren)
-        df_listing['Symbol'] = df_listing['Symbol'].apply(lambda x: '{:06d}'.format(x))
+        df_listing['Symbol'] = df_listing['Symbol'].astype(str).str.zfill(6)
         df_listing['ListingDate'] = pd.to_datetime(df_listing['ListingDate'])
+        return df_listing
 
+    @staticmethod
+    def _parse_finder(text):
         # KRX 주식종목검색
-        data = {
-            'bld': 'dbms/comm/finder/finder_stkisu',
-        }
-        r = requests.post('http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd', data=data)
-
-        jo = json.loads(r.text)
+        jo = json.loads(text)
         df_finder = json_normalize(jo, 'block1')
 
         # full_code, short_code, codeName, marketCode, marketName, marketEngName, ord1, ord2
@@ -66,83 +83,116 @@ class KrxStockListing:
                 'ord1': 'Ord1',
                 'ord2': 'Ord2',
             })
+        return df_finder
 
+    @staticmethod
+    def _merge(df_listing, df_finder):
         # 상장회사목록, 주식종목검색 병합
         df_left = df_finder[['Symbol', 'Market', 'Name']]
         df_right = df_listing[[
             'Symbol', 'Sector', 'Industry', 'ListingDate', 'SettleMonth', 'Representative', 'HomePage', 'Region'
         ]]
+        return pd.merge(df_left, df_right, how='left', left_on='Symbol', right_on='Symbol')
 
-        df_master = pd.merge(df_left, df_right, how='left', left_on='Symbol', right_on='Symbol')
+    def _select_market(self, df_master):
         if self.market in ['KONEX', 'KOSDAQ', 'KOSPI']:
             return df_master[df_master['Market'] == self.market]
         return df_master
 
-    def read_all(self):
-        # KRX 상장회사목록
-        # For mac, SSL CERTIFICATION VERIFICATION ERROR
-        ssl._create_default_https_context = ssl._create_unverified_context
-
-        url = 'http://kind.krx.co.kr/corpgeneral/corpList.do?method=download&searchType=13'
-        df_listing = pd.read_html(url, header=0, flavor='bs4', encoding='EUC-KR')[0]
-        cols_ren = {
-            '회사명': 'Name',
-            '종목코드': 'Symbol',
-            '업종': 'Sector',
-            '주요제품': 'Industry',
-            '상장일': 'ListingDate',
-            '결산월': 'SettleMonth',
-            '대표자명': 'Representative',
-            '홈페이지': 'HomePage',
-            '지역': 'Region',
-        }
-        df_listing = df_listing.rename(columns=cols_ren)
-        df_listing['Symbol'] = df_listing['Symbol'].apply(lambda x: '{:06d}'.format(x))
-        df_listing['ListingDate'] = pd.to_datetime(df_listing['ListingDate'])
-
-        # KRX 주식종목검색
-        data = {
-            'bld': 'dbms/comm/finder/finder_stkisu',
-        }
-        r = requests.post('http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd', data=data)
-
-        jo = json.loads(r.text)
-        df_finder = json_normalize(jo, 'block1')
-
-        # full_code, short_code, codeName, marketCode, marketName, marketEngName, ord1, ord2
-        df_finder = df_finder.rename(
-            columns={
-                'full_code': 'FullCode',
-                'short_code': 'Symbol',
-                'codeName': 'Name',
-                'marketCode': 'MarketCode',
-                'marketName': 'MarketName',
-                'marketEngName': 'Market',
-                'ord1': 'Ord1',
-                'ord2': 'Ord2',
-            })
+    @classmethod
+    def _cached_master(cls):
+        '''
+        KRX master built within cache_ttl (a copy), None when it has to be built
+        '''
+        master = cls._master
+        if master['df'] is None or time.time() - master['time'] >= cls.cache_ttl:
+            return None
+        return master['df'].copy()
+
+    @classmethod
+    def _store_master(cls, df_master):
+        cls._master = {'time': time.time(), 'df': df_master}
+        return df_master.copy()
+
+    @classmethod
+    def master(cls):
+        '''
+        every KRX stock: listing (KIND) merged with the finder (market), built once per cache_ttl
+        '''
+        with cls._master_lock:
+            df_master = cls._cached_master()
+            if df_master is None:
+                # For mac, SSL CERTIFICATION VERIFICATION ERROR
+                ssl._create_default_https_context = ssl._create_unverified_context
+
+                df_listing = cls._parse_listing(transport.get(cls.kind_url, cache_ttl=cls.cache_ttl).content)
+                df_finder = cls._parse_finder(
+                    transport.post(cls.finder_url, data=cls.finder_data, cache_ttl=cls.cache_ttl).text)
+                df_master = cls._store_master(cls._merge(df_listing, df_finder))
+            return df_master
 
-        # 상장회사목록, 주식종목검색 병합
-        df_left = df_finder[['Symbol', 'Market', 'Name']]
-        df_right = df_listing[[
-            'Symbol', 'Sector', 'Industry', 'ListingDate', 'SettleMonth', 'Representative', 'HomePage', 'Region'
-        ]]
+    def read(self):
+        return self._select_market(self.master())
+
+    # wisereport 에서 읽을 항목 {표의 항목명: 결과 컬럼명}, None 이면 파생 컬럼 계산에만 사용
+    summary_category = {'시가총액': '시가총액', 'PER': 'PER', 'PBR': 'PBR', 'FCF': '잉여현금흐름'}
+    profit_and_loss_category = {'매출액(수익)': '매출액', '매출총이익': '매출총이익', '영업이익': '영업이익', '당기순이익': '순이익'}
+    # 차입금: 단기 차입금 + 장기 차입금 + 비유동금융부채 + 사채 + 유동성 장기부채
+    financial_position_category = {
+        '자산총계': '총자산',
+        '단기차입금': None,
+        '장기차입금': None,
+        '비유동금융부채': None,
+        '사채': None,
+        '유동성장기부채': None
+    }
+    cash_flow_category = {'영업활동으로인한현금흐름': '영업활동현금흐름'}
+    statements = ['profit_and_loss', 'financial_position', 'cash_flow']
+
+    def _fetch_symbol(self, fetcher, code, today):
+        # 1년치 가격(월 수익률 변동성)과 wisereport 요약, 재무제표 3종
+        price_df = self.DataReader(code, today - timedelta(days=400), today)
+        pages = [fetcher.summary(code)] + fetcher.financial_statements(code, self.statements)
+        return price_df, pages
+
+    def _parse_symbol(self, price_df, pages, today):
+        record = {'data_exists': False}
+        if len(price_df):
+            record['월수익률변동성(년)'] = _monthly_return_volatility(price_df['Close'], today)
+        categories_group = [self.summary_category, self.profit_and_loss_category,
+                            self.financial_position_category, self.cash_flow_category]
+        for url_index, (rows, target_categories) in enumerate(zip(pages, categories_group)):
+            for category, tds in rows:
+                if category not in target_categories:
+                    continue
+                if url_index == 0:
+                    if category == '시가총액':
+                        try:
+                            record[f'{category}_0'] = float(re.sub(r'[^0-9]', '', tds[0]))
+                        except (IndexError, ValueError):
+                            continue
+                    else:
+                        record[f'{category}_0'] = _to_float(tds, 4)
+                        record[f'{category}_1'] = _to_float(tds, 3)
+                        record[f'{category}_4'] = _to_float(tds, 0)
+                else:
+                    record[f'{category}_0'] = _to_float(tds, 5)
+                    record[f'{category}_1'] = _to_float(tds, 4)
+                    record[f'{category}_4'] = _to_float(tds, 1)
+                record['data_exists'] = True
+        return record
+
+    def _assemble(self, df, records):
+        # 종목별 레코드를 한번에 붙이고, 레코드가 없는 종목(실패, 상장일 없음)은 0 으로 채움
+        categories_group = [self.summary_category, self.profit_and_loss_category,
+                            self.financial_position_category, self.cash_flow_category]
+        value_cols = ['월수익률변동성(년)'] + [
+            f'{category}_{q}' for categories in categories_group for category in categories for q in [0, 1, 4]]
+        fundamentals = pd.DataFrame.from_dict(records, orient='index').reindex(columns=['data_exists'] + value_cols)
+        df = df.join(fundamentals, on='Symbol')
+        df['data_exists'] = df['data_exists'].fillna(False).astype(bool)
+        df[value_cols] = df[value_cols].fillna(0.).astype(float)
 
-        df = pd.merge(df_left, df_right, how='left', left_on='Symbol', right_on='Symbol')
-        summary_category = {'시가총액': '시가총액', 'PER': 'PER', 'PBR': 'PBR', 'FCF': '잉여현금흐름'}
-        # 차입금: 단기 차입금 + 장기 차입금 + 비유동금융부채 + 사채 + 유동성 장기부채
-
-        profit_and_loss_category = {'매출액(수익)': '매출액', '매출총이익': '매출총이익', '영업이익': '영업이익', '당기순이익': '순이익'}
-        financial_position_category = {
-            '자산총계': '총자산',
-            '단기차입금': None,
-            '장기차입금': None,
-            '비유동금융부채': None,
-            '사채': None,
-            '유동성장기부채': None
-        }
-        cash_flow_category = {'영업활동으로인한현금흐름': '영업활동현금흐름'}
-        categories_group = [summary_category, profit_and_loss_category, financial_position_category, cash_flow_category]
         ren_cols = {
             'Symbol': 'Symbol',
             'Market': 'Market',
@@ -150,184 +200,14 @@ class KrxStockListing:
             'Sector': 'Sector',
             'Industry': 'Industry',
             'ListingDate': 'ListingDate',
+            'data_exists': 'data_exists',
+            '월수익률변동성(년)': '월수익률변동성(년)',
         }
-        df['data_exists'] = False
-        ren_cols['data_exists'] = 'data_exists'
-        df['월수익률변동성(년)'] = 0.
-        ren_cols['월수익률변동성(년)'] = '월수익률변동성(년)'
-
-        for categories_dict in categories_group:
-            for target_category, target_category_name in categories_dict.items():
-                df[f'{target_category}_0'] = 0.
-                df[f'{target_category}_1'] = 0.
-                df[f'{target_category}_4'] = 0.
+        for categories in categories_group:
+            for target_category, target_category_name in categories.items():
                 if target_category_name is not None:
                     ren_cols[f'{target_category}_0'] = f'{target_category_name}_0'
-                    # ren_cols[f'{target_category}_1'] = f'{target_category_name}_1'
-                    # ren_cols[f'{target_category}_4'] = f'{target_category_name}_4'
-        count = 0
-        for idx in range(len(df)):
-            current_idx = str(idx)
-            total_idx = str(len(df))
-            if idx % 20 == 0:
-                print(f'진행상황:{current_idx}/{total_idx}')
-            target = df[idx:idx + 1]
-            if pd.isna(target['ListingDate']).any():
-                continue
-            code = str(target['Symbol'].values[0])
-            count += 1
-            if count > 3:
-                break
-            today = datetime.date.today()
-            day_of_the_week = today.weekday()
-            if day_of_the_week >= 5:
-                minus = day_of_the_week - 4
-                start_day = today - timedelta(days=minus)
-            else:
-                start_day = today
-            # 어제 날짜: 오늘 - 1일
-            one_month = int(365 / 12)
-            year_price_delta_list = []
-            for _ in range(12):
-                while True:
-                    try:
-                        price_df = self.DataReader(code, start_day, start_day)
-                        price = price_df.iat[0, 3]
-                        break
-                    except:
-                        start_day = start_day - timedelta(days=1)
-                last_month = start_day - timedelta(days=one_month)
-                day_of_the_week = last_month.weekday()
-                if day_of_the_week >= 5:
-                    minus = day_of_the_week - 4
-                    last_month = last_month - timedelta(days=minus)
-                while True:
-                    try:
-                        price_df = self.DataReader(code, last_month, last_month)
-                        last_month_price = price_df.iat[0, 3]
-                        break
-                    except:
-                        last_month = last_month - timedelta(days=1)
-
-                earning_ratio = price / last_month_price - 1.
-                year_price_delta_list.append(earning_ratio)
-
-                start_day = last_month
-            std = np.std(np.array(year_price_delta_list))
-
-            df.loc[idx, '월수익률변동성(년)'] = float(std)
-
-            summary_url = f'https://navercomp.wisereport.co.kr/v2/company/c1010001.aspx?cmp_cd={code}'
-            financial_analysis_url = f'https://navercomp.wisereport.co.kr/v2/company/c1030001.aspx?cmp_cd={code}&cn='
-            urls = [[summary_url, summary_category.keys()], [financial_analysis_url,
-                                                             profit_and_loss_category.keys()],
-                    [financial_analysis_url, financial_position_category.keys()],
-                    [financial_analysis_url, cash_flow_category.keys()]]
-
-            for url_index, (target_url, target_categories) in enumerate(urls):
-                # scraper = cloudscraper.create_scraper(
-                #     browser={'browser': 'chrome', 'platform': 'windows', 'mobile': False})
-                # ratios_html = scraper.get(target_url).content
-                # ratios_soup = BeautifulSoup(ratios_html, 'lxml')
-                options = webdriver.ChromeOptions()
-                options.add_argument('headless')  # 웹 브라우저를 띄우지 않는 headless chrome 옵션 적용
-                options.add_argument('disable-gpu')  # GPU 사용 안함
-                options.add_argument('lang=ko_KR')  # 언어 설정
-                options.add_argument('no-sandbox')
-                options.add_argument('disable-dev-shm-usage')
-                driver = webdriver.Chrome(executable_path="/Users/user/PycharmProjects/auto_trading/chromedriver",
-                                          options=options)
-                print('target_url:', target_url)
-                driver.get(target_url)
-                if url_index == 0:
-                    try:
-                        elem = driver.find_element(By.ID, 'cns_Tab22')
-                        elem.click()
-                    except:
-                        pass
-                else:
-                    try:
-                        elem = driver.find_element(By.ID, 'frqTyp1')
-                        elem.click()
-                        elem = driver.find_element(By.ID, 'hfinGubun')
-                        elem.click()  # rpt_tab2
-                        if url_index == 1:
-                            elem = driver.find_element(By.ID, 'rpt_tab1')
-                        elif url_index == 2:
-                            elem = driver.find_element(By.ID, 'rpt_tab2')
-                        elif url_index == 3:
-                            elem = driver.find_element(By.ID, 'rpt_tab3')
-                        elem.click()  #
-                    except:
-                        pass
-                ratios_soup = BeautifulSoup(driver.page_source, 'html.parser')
-                if url_index == 0:
-                    tables1 = ratios_soup.find_all('table', {"class": "gHead"})
-                    tables2 = ratios_soup.find_all('table', {"class": "gHead01 all-width"})
-                    tables = tables1 + tables2
-                else:
-                    tables = ratios_soup.find_all('table', {"class": "gHead01 all-width data-list"})
-                for _, table in enumerate(tables):
-                    trs = table.tbody.find_all('tr')
-                    for tr in trs:
-                        try:
-                            if url_index == 0:
-                                category = str(tr.find('th').text).strip()
-                                if '(배)' in category:
-                                    category = category.replace('(배)', '').strip()
-                            else:
-                                spans = tr.find('td').find_all('span')
-                                for span in spans:
-                                    category = span.text.strip()
-                                    if category is not None:
-                                        if '펼치기' in category:
-                                            category = category.replace('펼치기', '').strip()
-                                        break
-                            for target_category in target_categories:
-                                if target_category == category:
-                                    tds = tr.find_all('td')
-                                    if url_index == 0:
-                                        if target_category == '시가총액':
-                                            text = str(tds[0].text)
-                                            text = float(re.sub(r'[^0-9]', '', text))
-                                            df.loc[idx, f'{target_category}_0'] = float(str(text).replace(",", ''))
-                                            df['data_exists'] = True
-                                        else:
-                                            try:
-                                                a_0 = float(str(tds[4].text).replace(",", ''))
-                                            except:
-                                                a_0 = 0.
-                                            try:
-                                                a_1 = float(str(tds[3].text).replace(",", ''))
-                                            except:
-                                                a_1 = 0.
-                                            try:
-                                                a_4 = float(str(tds[0].text).replace(",", ''))
-                                            except:
-                                                a_4 = 0.
-                                            df.loc[idx, f'{target_category}_0'] = a_0
-                                            df.loc[idx, f'{target_category}_1'] = a_1
-                                            df.loc[idx, f'{target_category}_4'] = a_4
-                                            df['data_exists'] = True
-                                    else:
-                                        try:
-                                            a_0 = float(str(tds[5].text).replace(",", ''))
-                                        except:
-                                            a_0 = 0.
-                                        try:
-                                            a_1 = float(str(tds[4].text).replace(",", ''))
-                                        except:
-                                            a_1 = 0.
-                                        try:
-                                            a_4 = float(str(tds[1].text).replace(",", ''))
-                                        except:
-                                            a_4 = 0.
-                                        df.loc[idx, f'{target_category}_0'] = a_0
-                                        df.loc[idx, f'{target_category}_1'] = a_1
-                                        df.loc[idx, f'{target_category}_4'] = a_4
-                                        df['data_exists'] = True
-                        except:
-                            pass
+
         eps = 0.00000001
         df['GP/A_0'] = (df['매출총이익_0'] / (df['자산총계_0']) + eps).astype(float)
         df['GP/A_1'] = (df['매출총이익_1'] / (df['자산총계_1']) + eps).astype(float)
@@ -347,11 +227,10 @@ class KrxStockListing:
         df['순이익성장률(년)'] = ((df['당기순이익_0'] / (df['당기순이익_4'] + eps)) - 1.).astype(float)
         ren_cols['순이익성장률(년)'] = '순이익성장률(년)'
 
-        #         # 차입금: 단기차입금 + 장기차입금 + 비유동금융부채 + 사채 + 유동성장기부채
-        df['차입금_0'] = (df['단기차입금_0'] + df['장기차입금_0'] + df['비유동금융부채_0'] + df['사채_0'] + df['유동성장기부채_0']).astype(float)
-        df['차입금_1'] = (df['단기차입금_1'] + df['장기차입금_1'] + df['비유동금융부채_1'] + df['사채_1'] + df['유동성장기부채_1']).astype(float)
-        df['차입금_4'] = (df['단기차입금_4'] + df['장기차입금_4'] + df['비유동금융부채_4'] + df['사채_4'] + df['유동성장기부채_4']).astype(float)
-
+        # 차입금: 단기차입금 + 장기차입금 + 비유동금융부채 + 사채 + 유동성장기부채
+        for q in [0, 1, 4]:
+            df[f'차입금_{q}'] = (df[f'단기차입금_{q}'] + df[f'장기차입금_{q}'] + df[f'비유동금융부채_{q}'] +
+                              df[f'사채_{q}'] + df[f'유동성장기부채_{q}']).astype(float)
         ren_cols['차입금_0'] = '차입금_0'
 
         a_0 = (df['영업이익_0'] / (df['차입금_0']) + eps).astype(float)
@@ -376,37 +255,58 @@ class KrxStockListing:
         ren_cols['1/PFCR_0'] = '1/PFCR_0'
 
         df = df[ren_cols.keys()]
-        df.rename(columns=ren_cols, inplace=True)
+        df = df.rename(columns=ren_cols)
         df.reset_index(drop=True, inplace=True)
-        df = df.round(3)
-        if self.market in ['KONEX', 'KOSDAQ', 'KOSPI']:
-            return df[df['Market'] == self.market]
-        return df
+        return df.round(3)
+
+    def read_all(self, max_workers=8, limit=None, retries=2):
+        '''
+        listing with monthly return volatility and quarterly fundamentals (wisereport) of each symbol
+        * max_workers: number of symbols fetched at the same time
+        * limit: read fundamentals of the first `limit` symbols only (None: all)
+        * retries: number of retries of a failed symbol. symbols still failing are reported with a warning
+        '''
+        df = self._select_market(self.master())
+
+        from FinanceDataReader.krx.wisereport import WisereportFetcher
+        fetcher = WisereportFetcher(chromedriver=self.chromedriver)
+        today = datetime.date.today()
+        symbols = list(df.loc[df['ListingDate'].notna(), 'Symbol'])[:limit]
+
+        def _record(code):
+            return self._parse_symbol(*self._fetch_symbol(fetcher, code, today), today)
+
+        records, errors = _map_symbols(_record, symbols, max_workers, retries)
+        return self._assemble(df, records)
 
 
 class KrxDelisting:
+    url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+    headers = {
+        'User-Agent': 'Chrome/78.0.3904.87 Safari/537.36',
+    }
+    data = {
+        'bld': 'dbms/MDC/STAT/issue/MDCSTAT23801',
+        'mktId': 'ALL',
+        'isuCd': 'ALL',
+        'isuCd2': 'ALL',
+        'strtDd': '19900101',
+        'endDd': '22001231',
+        'share': '1',
+        'csvxls_isNo': 'true',
+    }
+    cache_ttl = 24 * 3600
+
     def __init__(self, market):
         self.market = market
 
     def read(self):
-        data = {
-            'bld': 'dbms/MDC/STAT/issue/MDCSTAT23801',
-            'mktId': 'ALL',
-            'isuCd': 'ALL',
-            'isuCd2': 'ALL',
-            'strtDd': '19900101',
-            'endDd': '22001231',
-            'share': '1',
-            'csvxls_isNo': 'true',
-        }
-
-        headers = {
-            'User-Agent': 'Chrome/78.0.3904.87 Safari/537.36',
-        }
+        r = transport.post(self.url, self.data, headers=self.headers, cache_ttl=self.cache_ttl)
+        return self._parse(r.text)
 
-        url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
-        r = requests.post(url, data, headers=headers)
-        j = json.loads(r.text)
+    @staticmethod
+    def _parse(text):
+        j = json.loads(text)
         df = pd.json_normalize(j['output'])
         col_map = {
             'ISU_CD': 'Symbol',
@@ -437,16 +337,45 @@ class KrxDelisting:
 
 
 class KrxMarcapListing:
+    date_url = 'http://data.krx.co.kr/comm/bldAttendant/executeForResourceBundle.cmd?baseName=krx.mdc.i18n.component&key=B128.bld'
+    url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
+    cols_map = {
+        'ISU_SRT_CD': 'Code',
+        'ISU_ABBRV': 'Name',
+        'TDD_CLSPRC': 'Close',
+        'SECT_TP_NM': 'Dept',
+        'FLUC_TP_CD': 'ChangeCode',
+        'CMPPREVDD_PRC': 'Changes',
+        'FLUC_RT': 'ChagesRatio',
+        'ACC_TRDVOL': 'Volume',
+        'ACC_TRDVAL': 'Amount',
+        'TDD_OPNPRC': 'Open',
+        'TDD_HGPRC': 'High',
+        'TDD_LWPRC': 'Low',
+        'MKTCAP': 'Marcap',
+        'LIST_SHRS': 'Stocks',
+        'MKT_NM': 'Market',
+        'MKT_ID': 'MarketId'
+    }
+    # 패널(여러 날짜)의 컬럼 dtype: 가격은 int32, 수량/금액은 int64, 반복되는 문자열은 category
+    panel_dtypes = {
+        'Close': 'int32', 'Open': 'int32', 'High': 'int32', 'Low': 'int32', 'Changes': 'int32',
+        'ChangeCode': 'int8', 'ChagesRatio': 'float32',
+        'Volume': 'int64', 'Amount': 'int64', 'Marcap': 'int64', 'Stocks': 'int64',
+        'Name': 'category', 'Dept': 'category', 'Market': 'category', 'MarketId': 'category',
+    }
+
     def __init__(self, market):
         self.market = market
 
-    def read(self):
-        url = 'http://data.krx.co.kr/comm/bldAttendant/executeForResourceBundle.cmd?baseName=krx.mdc.i18n.component&key=B128.bld'
-        j = json.loads(requests.get(url).text)
-        date_str = j['result']['output'][0]['max_work_dt']
+    @staticmethod
+    def _parse_date(text):
+        j = json.loads(text)
+        return j['result']['output'][0]['max_work_dt']
 
-        url = 'http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd'
-        data = {
+    @staticmethod
+    def _data(date_str):
+        return {
             'bld': 'dbms/MDC/STAT/standard/MDCSTAT01501',
             'mktId': 'ALL',
             'trdDd': date_str,
@@ -454,8 +383,59 @@ class KrxMarcapListing:
             'money': '1',
             'csvxls_isNo': 'false',
         }
-        j = json.loads(requests.post(url, data).text)
+
+    def read(self, date=None):
+        '''
+        * date: trading day to read (default: the latest trading day)
+        '''
+        if date is None:
+            date_str = self._parse_date(transport.get(self.date_url).text)
+        else:
+            date_str = pd.to_datetime(date).strftime('%Y%m%d')
+        return self._parse(transport.post(self.url, self._data(date_str)).text)
+
+    def read_range(self, start, end=None, max_workers=8):
+        '''
+        every issue on every KRX session (trading calendar) of start ~ end, one request per day fetched concurrently
+        * max_workers: number of days requested at the same time
+        :return: DataFrame indexed by (Date, Code) in compact dtypes, days without data (holidays) are left out
+        a day that fails is retried, then reported with a warning and left out of the result
+        '''
+        days = get_calendar('KRX').sessions_in_range(start, end if end is not None else datetime.date.today())
+
+        def _read_day(date_str):
+            return self._parse(transport.post(self.url, self._data(date_str)).text)
+
+        records, _ = _map_symbols(_read_day, [day.strftime('%Y%m%d') for day in days], max_workers=max_workers,
+                                  progress_every=None, label='days')
+        frames = {day: records[day.strftime('%Y%m%d')] for day in days if day.strftime('%Y%m%d') in records}
+        frames = {day: df for day, df in frames.items() if len(df) and df['Close'].notna().any()}
+        if not len(frames):
+            return pd.DataFrame()
+        panel = pd.concat(frames, names=['Date', 'Number'])
+        panel = panel.reset_index('Number', drop=True).set_index('Code', append=True)
+        return self._compact(panel[[col for col in self.cols_map.values() if col != 'Code']].copy())
+
+    @classmethod
+    def _compact(cls, panel):
+        for col, dtype in cls.panel_dtypes.items():
+            if col not in panel:
+                continue
+            if dtype == 'category':
+                panel[col] = panel[col].astype(dtype)
+                continue
+            values = pd.to_numeric(panel[col], errors='coerce')  # Close, ChangeCode 는 문자열로 옴
+            if dtype.startswith('int') and values.isna().any():
+                dtype = dtype.capitalize()  # 결측값이 있으면 nullable 정수
+            panel[col] = values.astype(dtype)
+        return panel
+
+    @classmethod
+    def _parse(cls, text):
+        j = json.loads(text)
         df = pd.json_normalize(j['OutBlock_1'])
+        if not len(df):
+            return pd.DataFrame()
         df = df.replace(',', '', regex=True)
         numeric_cols = [
             'CMPPREVDD_PRC', 'FLUC_RT', 'TDD_OPNPRC', 'TDD_HGPRC', 'TDD_LWPRC', 'ACC_TRDVOL', 'ACC_TRDVAL', 'MKTCAP',
@@ -464,36 +444,24 @@ class KrxMarcapListing:
         df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
 
         df = df.sort_values('MKTCAP', ascending=False)
-        cols_map = {
-            'ISU_SRT_CD': 'Code',
-            'ISU_ABBRV': 'Name',
-            'TDD_CLSPRC': 'Close',
-            'SECT_TP_NM': 'Dept',
-            'FLUC_TP_CD': 'ChangeCode',
-            'CMPPREVDD_PRC': 'Changes',
-            'FLUC_RT': 'ChagesRatio',
-            'ACC_TRDVOL': 'Volume',
-            'ACC_TRDVAL': 'Amount',
-            'TDD_OPNPRC': 'Open',
-            'TDD_HGPRC': 'High',
-            'TDD_LWPRC': 'Low',
-            'MKTCAP': 'Marcap',
-            'LIST_SHRS': 'Stocks',
-            'MKT_NM': 'Market',
-            'MKT_ID': 'MarketId'
-        }
-        df = df.rename(columns=cols_map)
+        df = df.rename(columns=cls.cols_map)
         df.index = np.arange(len(df)) + 1
         return df
 
 
 class KrxAdministrative:
+    url = "http://kind.krx.co.kr/investwarn/adminissue.do?method=searchAdminIssueSub&currentPageSize=5000&forward=adminissue_down"
+    cache_ttl = 3600
+
     def __init__(self, market):
         self.market = market
 
     def read(self):
-        url = "http://kind.krx.co.kr/investwarn/adminissue.do?method=searchAdminIssueSub&currentPageSize=5000&forward=adminissue_down"
-        df = pd.read_html(url, header=0)[0]
+        return self._parse(transport.get(self.url, cache_ttl=self.cache_ttl).content)
+
+    @staticmethod
+    def _parse(content):
+        df = pd.read_html(io.BytesIO(content), header=0)[0]
         df['종목코드'] = df['종목코드'].apply(lambda x: '{:0>6d}'.format(x))
         df['지정일'] = pd.to_datetime(df['지정일'])
         col_map = {'종목코드': 'Symbol', '종목명': 'Name', '지정일': 'DesignationDate', '지정사유': 'Reason'}
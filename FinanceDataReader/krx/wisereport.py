@@ -0,0 +1,177 @@
+import re
+import json
+from lxml import html as lxml_html
+from FinanceDataReader import transport
+
+selenium_install_msg = '''
+selenium not installed. please install as follows
+
+wisereport 를 브라우저로 읽는 방식(fallback)은 selenium 에 의존성이 있습니다.
+다음과 같이 selenium을 설치하세요
+
+pip install selenium
+
+'''
+
+
+def _has_class(element, class_name):
+    # BeautifulSoup 의 find_all('table', {'class': ...}) 과 같은 조건: 전체 문자열이 같거나 클래스 중 하나가 같음
+    classes = element.get('class', '')
+    return classes == class_name or class_name in classes.split()
+
+
+def _table_rows(page, table_classes, label_in_th=True):
+    '''
+    (category, cells) rows of the tables of the given classes, in the order of table_classes
+    cells are the text of the <td>s of the row
+    '''
+    if not page:
+        return []
+    doc = lxml_html.fromstring(page)
+    rows = []
+    for class_name in table_classes:
+        for table in doc.iter('table'):
+            if not _has_class(table, class_name):
+                continue
+            for tr in table.xpath('./tbody/tr') or table.xpath('.//tr'):
+                tds = tr.findall('td')
+                if label_in_th:
+                    th = tr.find('th')
+                    if th is None:
+                        continue
+                    category = th.text_content().strip().replace('(배)', '').strip()
+                else:
+                    if not len(tds):
+                        continue
+                    spans = tds[0].findall('.//span')
+                    label = spans[0].text_content() if len(spans) else tds[0].text_content()
+                    category = label.replace('펼치기', '').strip()
+                rows.append((category, [td.text_content() for td in tds]))
+    return rows
+
+
+class WisereportFetcher:
+    '''
+    quarterly company tables of navercomp.wisereport.co.kr over plain HTTP
+    (the AJAX endpoints behind the 'cns_Tab22', 'frqTyp1' and 'rpt_tab1..3' tabs)
+    * base_url: wisereport host, can point to a local stub server
+    * chromedriver: path of chromedriver. when given, selenium is used as a fallback if the direct fetch fails
+    '''
+    summary_path = '/v2/company/c1010001.aspx?cmp_cd={code}'
+    summary_ajax_path = '/v2/company/cF1001.aspx?cmp_cd={code}&fin_typ=0&freq_typ=Q&encparam={encparam}&id={id}'
+    finance_path = '/v2/company/c1030001.aspx?cmp_cd={code}&cn='
+    finance_ajax_path = '/v2/company/cF3002.aspx?cmp_cd={code}&frq=1&rpt={rpt}&finGubun=MAIN&frqTyp=1&cn=&encparam={encparam}'
+    reports = {'profit_and_loss': 0, 'financial_position': 1, 'cash_flow': 2}
+
+    def __init__(self, base_url='https://navercomp.wisereport.co.kr', chromedriver=None):
+        self.base_url = base_url.rstrip('/')
+        self.chromedriver = chromedriver
+
+    def _get(self, url, referer=None):
+        headers = {'User-Agent': 'Mozilla/5.0'}
+        if referer:
+            headers.update({'Referer': referer, 'X-Requested-With': 'XMLHttpRequest'})
+        r = transport.get(url, headers=headers)
+        r.raise_for_status()
+        return r.text
+
+    @staticmethod
+    def _page_param(page, name):
+        m = re.search(r"\b%s\s*:\s*'([^']*)'" % name, page)
+        return m.group(1) if m else ''
+
+    def summary(self, code):
+        '''
+        rows of the summary page: the 'gHead' tables (시가총액, PER, PBR ...) and
+        the quarterly financial summary ('gHead01 all-width')
+        a failed request is raised, unless chromedriver is given (then selenium is used instead)
+        '''
+        page_url = self.base_url + self.summary_path.format(code=code)
+        try:
+            page = self._get(page_url)
+            ajax_url = self.base_url + self.summary_ajax_path.format(
+                code=code, encparam=self._page_param(page, 'encparam'), id=self._page_param(page, 'id'))
+            quarterly = self._get(ajax_url, referer=page_url)
+            rows = _table_rows(page, ['gHead']) + _table_rows(quarterly, ['gHead01 all-width'])
+        except Exception:
+            if not self.chromedriver:
+                raise
+            rows = []
+        if not rows and self.chromedriver:
+            page = self._browse(page_url, ['cns_Tab22'])
+            rows = _table_rows(page, ['gHead', 'gHead01 all-width'])
+        return rows
+
+    def _statement_rows(self, code, rpt, page_url, page):
+        ajax_url = self.base_url + self.finance_ajax_path.format(
+            code=code, rpt=rpt, encparam=self._page_param(page, 'encparam'))
+        jo = json.loads(self._get(ajax_url, referer=page_url))
+        rows = []
+        for item in jo.get('DATA') or []:
+            category = str(item.get('ACC_NM', '')).replace('펼치기', '').strip().lstrip('.').strip()
+            cells = [category] + ['' if item.get(f'DATA{n}') is None else str(item[f'DATA{n}']) for n in range(1, 7)]
+            rows.append((category, cells))
+        return rows
+
+    def financial_statements(self, code, reports=('profit_and_loss', 'financial_position', 'cash_flow')):
+        '''
+        quarterly rows of financial statements, the page holding encparam is fetched once for all of them
+        * reports: 'profit_and_loss', 'financial_position', 'cash_flow'
+        each row is (category, [category, DATA1, ..., DATA6]) as laid out in the html table
+        a failed request is raised, unless chromedriver is given (then selenium is used instead)
+        :return: list of rows, in the order of reports
+        '''
+        page_url = self.base_url + self.finance_path.format(code=code)
+        page = None
+        try:
+            page = self._get(page_url)
+        except Exception:
+            if not self.chromedriver:
+                raise
+        statements = []
+        for report in reports:
+            rpt = self.reports[report]
+            rows = []
+            if page is not None:
+                try:
+                    rows = self._statement_rows(code, rpt, page_url, page)
+                except Exception:
+                    if not self.chromedriver:
+                        raise
+            if not rows and self.chromedriver:
+                page_source = self._browse(page_url, ['frqTyp1', 'hfinGubun', f'rpt_tab{rpt + 1}'])
+                rows = _table_rows(page_source, ['gHead01 all-width data-list'], label_in_th=False)
+            statements.append(rows)
+        return statements
+
+    def financial_statement(self, code, report):
+        '''
+        quarterly rows of a financial statement
+        * report: 'profit_and_loss', 'financial_position', 'cash_flow'
+        '''
+        return self.financial_statements(code, [report])[0]
+
+    def _browse(self, url, click_ids):
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.common.by import By
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError(selenium_install_msg)
+
+        options = webdriver.ChromeOptions()
+        options.add_argument('headless')  # 웹 브라우저를 띄우지 않는 headless chrome 옵션 적용
+        options.add_argument('disable-gpu')  # GPU 사용 안함
+        options.add_argument('lang=ko_KR')  # 언어 설정
+        options.add_argument('no-sandbox')
+        options.add_argument('disable-dev-shm-usage')
+        driver = webdriver.Chrome(executable_path=self.chromedriver, options=options)
+        try:
+            driver.get(url)
+            try:
+                for elem_id in click_ids:
+                    driver.find_element(By.ID, elem_id).click()
+            except Exception:
+                pass
+            return driver.page_source
+        finally:
+            driver.quit()
@@ -1,7 +1,9 @@
 import re
 import pandas as pd
+from io import BytesIO
 
-from FinanceDataReader._utils import (_convert_letter_to_num, _validate_dates)
+from FinanceDataReader._utils import (_convert_letter_to_num_series, _validate_dates)
+from FinanceDataReader import transport
 
 class NasdaqStockListing:
     def __init__(self, market):
@@ -10,9 +12,9 @@ class NasdaqStockListing:
     def read(self):
         url = 'http://old.nasdaq.com/screening/companies-by-name.aspx?' \
                 'letter=0&render=download&exchange=' + self.market.lower()
-        df = pd.read_csv(url)
+        df = pd.read_csv(BytesIO(transport.get(url).content))
         df['MarketCap'] = df['MarketCap'].fillna('')
-        df['MarketCap'] = df['MarketCap'].apply(_convert_letter_to_num)
+        df['MarketCap'] = _convert_letter_to_num_series(df['MarketCap'])
         df = df.sort_values('MarketCap', ascending=False)
         df = df.drop('Unnamed: 8', axis=1)
         df = df.reset_index(drop=True)
@@ -1,36 +1,193 @@
 import re
-import requests
+import numpy as np
 import pandas as pd
-from io import StringIO
+from datetime import datetime, timedelta
 from FinanceDataReader._utils import (
     _filter_by_date, _replace_ohl_0_with_c, _validate_dates)
+from FinanceDataReader._store import ColumnarStore
+from FinanceDataReader.trading_calendar import get_calendar
+from FinanceDataReader import transport
+
+
+_item_pattern = re.compile(rb'<item data="([^"]*)"')
+
+
+def _to_datetime64(raw):
+    # YYYYMMDD 또는 YYYYMMDDHHMM 정수를 문자열 파싱 없이 datetime64 로 변환
+    minute = raw >= 10 ** 11
+    ymd = np.where(minute, raw // 10000, raw)
+    hhmm = np.where(minute, raw % 10000, 0)
+    months = (ymd // 10000 - 1970) * 12 + (ymd // 100) % 100 - 1
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + (ymd % 100 - 1)
+    return (days.astype('datetime64[m]') + (hhmm // 100) * 60 + hhmm % 100).astype('datetime64[ns]')
+
+
+def _parse_fchart(content):
+    '''
+    parse the <item data="date|open|high|low|close|volume" /> payload of fchart (bytes) into numpy columns
+    'null' prices (open, high, low of minute bars) are filled with the close
+    :return: dict of numpy arrays ('Date', 'Open', 'High', 'Low', 'Close', 'Volume'), None when there is no item
+    '''
+    items = _item_pattern.findall(content)
+    if len(items) == 0:
+        return None
+    # 모든 item 을 '|' 로 이어서 한번에 숫자로 변환 (날짜 YYYYMMDDHHMM, 거래량도 float64 로 정확히 표현됨)
+    values = np.fromstring(b'|'.join(items).replace(b'null', b'nan'), dtype=np.float64, sep='|')
+    if values.size != len(items) * 6:
+        raise ValueError(f'unexpected fchart item format: {items[0]!r}')
+    arr = values.reshape(-1, 6)
+    close = arr[:, 4]
+    prices = np.where(np.isnan(arr[:, 1:5]), close[:, None], arr[:, 1:5])
+    if np.array_equal(prices, np.round(prices)):
+        prices = prices.astype(np.int64)
+    cols = {'Date': _to_datetime64(arr[:, 0].astype(np.int64))}
+    for i, name in enumerate(['Open', 'High', 'Low', 'Close']):
+        cols[name] = prices[:, i]
+    cols['Volume'] = arr[:, 5].astype(np.int64)
+    return cols
 
 
 class NaverDailyReader:
-    def __init__(self, symbol, start=None, end=None, exchange=None, data_source=None):
+    timeframes = ['day', 'week', 'month', 'minute']
+    max_counts = {'day': 6000, 'week': 6000, 'month': 6000, 'minute': 30000}
+    count_margin = 5
+    minutes_per_session = 390  # 09:00 ~ 15:30
+
+    def __init__(self, symbol, start=None, end=None, exchange=None, data_source=None, cache_dir=None, refresh=False,
+                 timeframe='day'):
+        '''
+        * cache_dir: 지정하면 가격을 종목별로 디스크에 저장하고, 이후에는 마지막 저장일 이후의 데이터만 받아서 추가 (분봉 제외)
+        * refresh: True 이면 저장된 데이터를 무시하고 전체 데이터를 다시 받아서 저장
+        * timeframe: 'day'(default), 'week', 'month', 'minute'
+        '''
+        if timeframe not in self.timeframes:
+            raise ValueError(f"timeframe='{timeframe}' is not supported. use one of {self.timeframes}")
         self.symbol = symbol
         start, end = _validate_dates(start, end)
+        end = pd.Timestamp(end)
+        if timeframe == 'minute' and end == end.normalize():
+            end = end + timedelta(days=1) - timedelta(microseconds=1)  # 날짜만 주어지면 그날 장 마감까지
         self.start = start
         self.end = end
+        self.timeframe = timeframe
+        self.max_count = self.max_counts[timeframe]
+        self.store = ColumnarStore(cache_dir, f'naver/{timeframe}') if cache_dir and timeframe != 'minute' else None
+        self.refresh = refresh
 
-    def read(self):
-        url = 'https://fchart.stock.naver.com/sise.nhn?timeframe=day&count=6000&requestType=0&symbol='
-        r = requests.get(url + self.symbol)
+    def _bar_count(self, since):
+        '''
+        number of bars to request to cover since ~ today
+        KRX sessions of the trading calendar, plus one prior bar so that Change of the first row
+        is correct, plus a safety margin (for closures the calendar does not know)
+        '''
+        since = pd.Timestamp(since).date()
+        today = datetime.today().date()
+        if self.timeframe == 'week':
+            bars = (today - since).days // 7 + 1
+        elif self.timeframe == 'month':
+            bars = (today.year - since.year) * 12 + today.month - since.month + 1
+        else:
+            cal = get_calendar('KRX')
+            first = pd.Timestamp(cal.start).date()
+            if since < first:
+                # 달력의 휴일표 이전 기간은 평일 수로 (조금 더 요청할 뿐)
+                bars = int(np.busday_count(since, first)) + cal.session_count(first, today)
+            else:
+                bars = cal.session_count(since, today)
+            if self.timeframe == 'minute':
+                bars = bars * self.minutes_per_session
+        return int(min(max(bars, 0) + 1 + self.count_margin, self.max_count))
+
+    def _url(self, count):
+        return f'https://fchart.stock.naver.com/sise.nhn?timeframe={self.timeframe}&count={count}&requestType=0&symbol=' \
+            + self.symbol
 
-        data_list = re.findall('<item data=\"(.*?)\" />', r.text, re.DOTALL)
-        if len(data_list) == 0:
+    def _frame(self, cols):
+        if cols is None:
             return pd.DataFrame()
-        data = '\n'.join(data_list)
-        df = pd.read_csv(StringIO(data), delimiter='|',
-                         header=None, dtype={0: str})
-        df.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
-        df['Date'] = pd.to_datetime(df['Date'], format='%Y%m%d')
-        df.set_index('Date', inplace=True)
+        df = pd.DataFrame(cols).set_index('Date')
+        prices = ['Open', 'High', 'Low', 'Close']
+        if self.timeframe == 'minute' and all(df[col].dtype.kind == 'i' for col in prices) \
+                and df[prices].to_numpy().max(initial=0) <= np.iinfo(np.int32).max:
+            # 분봉은 데이터가 크므로 정수 가격은 int32 (소수 가격은 float64 그대로)
+            df = df.astype({col: np.int32 for col in prices})
         df.sort_index(inplace=True)
-        df['Change'] = df['Close'].pct_change()
+        return df
 
-        df = _filter_by_date(df, self.start, self.end)
+    def _fetch(self, count):
+        if self.timeframe == 'minute':
+            return self._fetch_minute(count)
+        r = transport.get(self._url(count))
+        return self._frame(_parse_fchart(r.content))
 
+    def _fetch_minute(self, count, chunk_size=1 << 20):
+        # 분봉은 응답이 크므로 스트리밍으로 받으면서 완성된 줄 단위로 파싱
+        r = transport.get(self._url(count), stream=True)
+        parts, rest = [], b''
+        for chunk in r.iter_content(chunk_size=chunk_size):
+            buf = rest + chunk
+            cut = buf.rfind(b'\n') + 1
+            buf, rest = buf[:cut], buf[cut:]
+            cols = _parse_fchart(buf)
+            if cols is not None:
+                parts.append(cols)
+        r.close()
+        cols = _parse_fchart(rest)
+        if cols is not None:
+            parts.append(cols)
+        if len(parts) == 0:
+            return pd.DataFrame()
+        return self._frame({name: np.concatenate([p[name] for p in parts]) for name in parts[0]})
+
+    def _read_history(self):
+        if self.store is None:
+            return self._fetch(self._bar_count(self.start))
+
+        stored = None if self.refresh else self.store.load(self.symbol)
+        if stored is None or len(stored) == 0:
+            df = self._fetch(self.max_count)
+            if len(df):
+                self.store.save(self.symbol, df)
+            return df
+
+        # 마지막 저장일(장중에 저장된 값일 수 있으므로 다시 받음)부터 오늘까지
+        new = self._fetch(self._bar_count(stored.index[-1]))
+        if len(new) == 0:
+            return stored
+        if self._restated(stored, new):
+            # 액면분할 등으로 과거 가격이 수정되었으면 저장된 전체 데이터를 다시 받음
+            df = self._fetch(self.max_count)
+            self.store.save(self.symbol, df)
+            return df
+        return self.store.append(self.symbol, new)
+
+    @staticmethod
+    def _restated(stored, new):
+        '''
+        True when a stored bar that is also in the new bars has other OHLC values (prices adjusted after a split ...)
+        the last stored bar may have been saved during the session, so it is compared only when it is the only overlap
+        '''
+        prices = ['Open', 'High', 'Low', 'Close']
+        overlap = stored.index.intersection(new.index)
+        if len(overlap) > 1:
+            overlap = overlap[overlap < stored.index[-1]]
+        if len(overlap) == 0:
+            return False
+        old_values = stored.loc[overlap, prices].to_numpy(dtype=float)
+        new_values = new.loc[overlap, prices].to_numpy(dtype=float)
+        return not np.array_equal(old_values, new_values)
+
+    def read(self):
+        return self._postprocess(self._read_history())
+
+    def _postprocess(self, df):
+        if len(df) == 0:
+            return pd.DataFrame()
+        df['Change'] = df['Close'].pct_change()
+
+        # 전체 데이터에서 값을 바꾼 뒤 기간을 자름 (_filter_by_date 의 결과는 원본의 view 일 수 있음)
         df = _replace_ohl_0_with_c(df)
 
+        df = _filter_by_date(df, self.start, self.end)
+
         return df
@@ -0,0 +1,346 @@
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+
+# 음력 기반 휴일의 양력 날짜 (설날, 석가탄신일, 단오, 추석/중추절, 훙왕 기일(3/10), 중양절(9/9))
+# 표에 없는 연도는 이 휴일들이 빠지므로 get_calendar 의 달력은 그 연도를 조회하면 경고
+_lunar = {
+    2015: ('02-19', '05-25', '06-20', '09-27', '04-28', '10-21'),
+    2016: ('02-08', '05-14', '06-09', '09-15', '04-16', '10-09'),
+    2017: ('01-28', '05-03', '05-30', '10-04', '04-06', '10-28'),
+    2018: ('02-16', '05-22', '06-18', '09-24', '04-25', '10-17'),
+    2019: ('02-05', '05-12', '06-07', '09-13', '04-14', '10-07'),
+    2020: ('01-25', '04-30', '06-25', '10-01', '04-02', '10-25'),
+    2021: ('02-12', '05-19', '06-14', '09-21', '04-21', '10-14'),
+    2022: ('02-01', '05-08', '06-03', '09-10', '04-10', '10-04'),
+    2023: ('01-22', '05-27', '06-22', '09-29', '04-29', '10-23'),
+    2024: ('02-10', '05-15', '06-10', '09-17', '04-18', '10-11'),
+    2025: ('01-29', '05-05', '05-31', '10-06', '04-07', '10-29'),
+    2026: ('02-17', '05-24', '06-19', '09-25', '04-26', '10-18'),
+    2027: ('02-06', '05-13', '06-09', '09-15', '04-16', '10-08'),
+    2028: ('01-26', '05-02', '05-28', '10-03', '04-04', '10-26'),
+    2029: ('02-13', '05-20', '06-16', '09-22', '04-23', '10-16'),
+    2030: ('02-03', '05-09', '06-05', '09-12', '04-12', '10-05'),
+}
+
+
+# 한국 음력과 날짜가 다른 중국 음력 휴일 (홍콩)
+_lunar_cn = {
+    2023: {'buddha': '05-26'},
+}
+
+
+def _lunar_dates(year, country='KR'):
+    if year not in _lunar:
+        return {}
+    names = ['lunar_new_year', 'buddha', 'dragon_boat', 'mid_autumn', 'hung_kings', 'chung_yeung']
+    days = dict(zip(names, _lunar[year]))
+    if country == 'CN':
+        days.update(_lunar_cn.get(year, {}))
+    return {name: date(year, int(md[:2]), int(md[3:])) for name, md in days.items()}
+
+
+def _nth_weekday(year, month, weekday, n):
+    # n 번째(n=-1 이면 마지막) weekday(월=0) 의 날짜
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    # 그레고리력 부활절 (Anonymous Gregorian algorithm)
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+
+def _observed(d):
+    # 토요일 휴일은 금요일, 일요일 휴일은 월요일에 쉼
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def _substitute(d, holidays, weekdays=(5, 6), overlapped=False):
+    # 대체휴일: 휴일이 weekdays(토=5, 일=6) 이거나 다른 휴일과 겹치면(overlapped) 그 다음의 휴일이 아닌 평일
+    if d.weekday() not in weekdays and not overlapped:
+        return None
+    s = d + timedelta(days=1)
+    while s.weekday() >= 5 or s in holidays:
+        s += timedelta(days=1)
+    return s
+
+
+def _us_holidays(year):
+    days = []
+    new_year = date(year, 1, 1)
+    if new_year.weekday() == 6:
+        days.append(new_year + timedelta(days=1))
+    elif new_year.weekday() < 5:
+        days.append(new_year)  # 토요일이면 전날(12/31)에 쉬지 않음
+    if year >= 1998:
+        days.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    days.append(_nth_weekday(year, 2, 0, 3))  # Washington's Birthday
+    days.append(_easter(year) - timedelta(days=2))  # Good Friday
+    days.append(_nth_weekday(year, 5, 0, -1))  # Memorial Day
+    if year >= 2022:
+        days.append(_observed(date(year, 6, 19)))  # Juneteenth
+    days.append(_observed(date(year, 7, 4)))  # Independence Day
+    days.append(_nth_weekday(year, 9, 0, 1))  # Labor Day
+    days.append(_nth_weekday(year, 11, 3, 4))  # Thanksgiving
+    days.append(_observed(date(year, 12, 25)))  # Christmas
+    return days
+
+
+def _krx_holidays(year):
+    # (휴일, 대체휴일이 적용되는 연도, 대체휴일이 적용되는 요일)
+    named = [(date(year, m, d), 2021, (5, 6)) for m, d in [(3, 1), (8, 15), (10, 3)]]
+    named += [(date(year, 1, 1), None, ()), (date(year, 5, 1), None, ()), (date(year, 6, 6), None, ()),
+              (date(year, 5, 5), 2014, (5, 6)), (date(year, 12, 25), 2023, (5, 6))]
+    if year >= 2013:
+        named.append((date(year, 10, 9), 2021, (5, 6)))
+    lunar = _lunar_dates(year)
+    for name in ['lunar_new_year', 'mid_autumn']:
+        if name in lunar:
+            named += [(lunar[name] + timedelta(days=k), 2014, (6,)) for k in [-1, 0, 1]]
+    if 'buddha' in lunar:
+        named.append((lunar['buddha'], 2023, (5, 6)))
+
+    # 대체휴일: 설날, 추석(2014~, 일요일), 어린이날(2014~), 삼일절, 광복절, 개천절, 한글날(2021~), 석가탄신일, 성탄절(2023~)
+    days = {d for d, _, _ in named}
+    for i, (d, since, weekdays) in enumerate(named):
+        if since is None or year < since:
+            continue
+        overlapped = any(d == other for j, (other, _, _) in enumerate(named) if j < i)
+        s = _substitute(d, days, weekdays, overlapped)
+        if s:
+            days.add(s)
+
+    # 연말 휴장일: 그해의 마지막 영업일 (12/31 이 주말이면 그 전 금요일)
+    year_end = date(year, 12, 31)
+    while year_end.weekday() >= 5 or year_end in days:
+        year_end -= timedelta(days=1)
+    days.add(year_end)
+    return sorted(days)
+
+
+def _tse_holidays(year):
+    n = year - 1980
+    vernal = date(year, 3, int(20.8431 + 0.242194 * n - n // 4))
+    autumnal = date(year, 9, int(23.2488 + 0.242194 * n - n // 4))
+    national = [date(year, 1, 1), date(year, 2, 11), vernal, date(year, 4, 29), date(year, 5, 3), date(year, 5, 4),
+                date(year, 5, 5), autumnal, date(year, 11, 3), date(year, 11, 23)]
+    if year >= 2000:
+        national += [_nth_weekday(year, 1, 0, 2), _nth_weekday(year, 10, 0, 2)]  # 成人の日, スポーツの日
+    if year >= 2003:
+        national += [_nth_weekday(year, 7, 0, 3), _nth_weekday(year, 9, 0, 3)]  # 海の日, 敬老の日
+    if year >= 2016:
+        national.append(date(year, 8, 11))  # 山の日
+    if 1989 <= year <= 2018:
+        national.append(date(year, 12, 23))
+    if year >= 2020:
+        national.append(date(year, 2, 23))
+    # 国民の休日: 앞뒤 날이 모두 공휴일인 날 (敬老の日 과 秋分の日 사이 ...)
+    national += [d + timedelta(days=1) for d in national
+                 if d + timedelta(days=2) in national and d + timedelta(days=1) not in national]
+    days = set(national) | {date(year, 1, 2), date(year, 1, 3), date(year, 12, 31)}
+    for d in national:
+        s = _substitute(d, days, weekdays=(6,))  # 振替休日
+        if s:
+            days.add(s)
+    return sorted(days)
+
+
+def _qingming(year):
+    return date(year, 4, 4 if year % 4 in (0, 1) else 5)
+
+
+def _china_holidays(year):
+    days = {date(year, 1, 1), _qingming(year)}
+    days.update(date(year, 5, d) for d in range(1, 4))
+    days.update(date(year, 10, d) for d in range(1, 8))
+    lunar = _lunar_dates(year)
+    if lunar:
+        days.update(lunar['lunar_new_year'] + timedelta(days=k) for k in range(-1, 6))
+        days.update([lunar['dragon_boat'], lunar['mid_autumn']])
+    return sorted(days)
+
+
+def _hkex_holidays(year):
+    easter = _easter(year)
+    named = [date(year, 1, 1), easter - timedelta(days=2), easter + timedelta(days=1), _qingming(year),
+             date(year, 5, 1), date(year, 7, 1), date(year, 10, 1), date(year, 12, 25), date(year, 12, 26)]
+    lunar = _lunar_dates(year, 'CN')
+    if lunar:
+        named += [lunar['lunar_new_year'] + timedelta(days=k) for k in range(0, 3)]
+        named += [lunar['buddha'], lunar['dragon_boat'], lunar['mid_autumn'] + timedelta(days=1), lunar['chung_yeung']]
+
+    # 일요일이거나 다른 휴일과 겹치는 휴일은 그 다음의 휴일이 아닌 평일에 쉼 (설 연휴가 일요일을 포함하면 설 4일째)
+    named.sort()
+    days = set(named)
+    for i, d in enumerate(named):
+        s = _substitute(d, days, weekdays=(6,), overlapped=d in named[:i])
+        if s:
+            days.add(s)
+    return sorted(days)
+
+
+def _hose_holidays(year):
+    named = [date(year, 1, 1), date(year, 4, 30), date(year, 5, 1), date(year, 9, 2)]
+    lunar = _lunar_dates(year)
+    if lunar:
+        named.append(lunar['hung_kings'])  # 훙왕 기일 (음력 3/10)
+    days = set(named)
+    if lunar:
+        days.update(lunar['lunar_new_year'] + timedelta(days=k) for k in range(-1, 4))
+    for d in sorted(named):
+        s = _substitute(d, days)  # 주말과 겹치면 다음 평일
+        if s:
+            days.add(s)
+    return sorted(days)
+
+
+_holiday_rules = {
+    'KRX': _krx_holidays,
+    'NYSE': _us_holidays,
+    'NASDAQ': _us_holidays,
+    'AMEX': _us_holidays,
+    'SSE': _china_holidays,
+    'SZSE': _china_holidays,
+    'HKEX': _hkex_holidays,
+    'TSE': _tse_holidays,
+    'HOSE': _hose_holidays,
+}
+
+
+class TradingCalendar:
+    '''
+    trading sessions of an exchange: weekdays of weekmask except holidays, backed by numpy.busdaycalendar
+    every lookup accepts a date or an array of dates and is vectorized
+    * holidays: dates the exchange is closed on weekdays
+    * weekmask: trading weekdays, Mon ~ Sun (default: '1111100')
+    * name: name of the calendar (ex: 'KRX')
+    * start, end: dates the holidays are complete for, looking up a date out of them warns (default: no bound)
+    '''
+    def __init__(self, holidays=(), weekmask='1111100', name=None, start=None, end=None):
+        self.name = name
+        self.weekmask = weekmask
+        self.holidays = np.unique(np.asarray(pd.to_datetime(list(holidays)).values, dtype='datetime64[D]'))
+        self._cal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+        self.start = None if start is None else np.datetime64(pd.Timestamp(start).date(), 'D')
+        self.end = None if end is None else np.datetime64(pd.Timestamp(end).date(), 'D')
+
+    @classmethod
+    def from_history(cls, index, weekmask='1111100', name=None, extend=None):
+        '''
+        calendar whose sessions are the dates of a price history (ex: the index of a cached KS11 or KRX stock)
+        weekdays missing from the history are holidays. after the last date of the history,
+        the holidays of `extend` (a TradingCalendar, ex: get_calendar('KRX')) are used
+        '''
+        days = np.unique(np.asarray(pd.DatetimeIndex(index).values, dtype='datetime64[D]'))
+        if not len(days):
+            return extend if extend is not None else cls(weekmask=weekmask, name=name)
+        weekdays = np.arange(days[0], days[-1] + 1, dtype='datetime64[D]')
+        weekdays = weekdays[np.is_busday(weekdays, weekmask=weekmask)]
+        holidays = np.setdiff1d(weekdays, days)
+        if extend is not None:
+            holidays = np.concatenate([holidays, extend.holidays[extend.holidays > days[-1]]])
+            return cls(holidays, weekmask, name or extend.name, days[0], extend.end)
+        return cls(holidays, weekmask, name)
+
+    def _days(self, dates):
+        if np.ndim(dates):
+            days = np.asarray(pd.to_datetime(dates).values, dtype='datetime64[D]')
+        else:
+            days = np.datetime64(pd.Timestamp(dates).date(), 'D')
+        if np.size(days) and ((self.start is not None and np.min(days) < self.start)
+                              or (self.end is not None and np.max(days) > self.end)):
+            warnings.warn(f'{self.name} calendar has the holidays of {self.start} ~ {self.end} only, '
+                          f'sessions out of this period can be wrong')
+        return days
+
+    @staticmethod
+    def _result(days, dates):
+        if np.ndim(dates):
+            return pd.DatetimeIndex(days.astype('datetime64[ns]'))
+        return pd.Timestamp(days)
+
+    def is_session(self, dates):
+        return np.is_busday(self._days(dates), busdaycal=self._cal)
+
+    def previous_session(self, dates, inclusive=False):
+        '''
+        last session before each date (on or before it when inclusive=True)
+        '''
+        days = self._days(dates)
+        if inclusive:
+            return self._result(np.busday_offset(days, 0, roll='backward', busdaycal=self._cal), dates)
+        return self._result(np.busday_offset(days, -1, roll='forward', busdaycal=self._cal), dates)
+
+    def next_session(self, dates, inclusive=False):
+        '''
+        first session after each date (on or after it when inclusive=True)
+        '''
+        days = self._days(dates)
+        if inclusive:
+            return self._result(np.busday_offset(days, 0, roll='forward', busdaycal=self._cal), dates)
+        return self._result(np.busday_offset(days, 1, roll='backward', busdaycal=self._cal), dates)
+
+    def sessions_in_range(self, start, end):
+        '''
+        sessions of start ~ end (both inclusive) as a DatetimeIndex
+        '''
+        days = np.arange(self._days(start), self._days(end) + 1, dtype='datetime64[D]')
+        return pd.DatetimeIndex(days[np.is_busday(days, busdaycal=self._cal)].astype('datetime64[ns]'))
+
+    def session_count(self, start, end):
+        '''
+        number of sessions of start ~ end (both inclusive)
+        '''
+        return int(np.busday_count(self._days(start), self._days(end) + 1, busdaycal=self._cal))
+
+
+# 음력 휴일이 있는 거래소
+_lunar_exchanges = ['KRX', 'SSE', 'SZSE', 'HKEX', 'HOSE']
+
+_calendars = {}
+_calendars_lock = threading.Lock()
+
+
+def get_calendar(exchange, start_year=1990, end_year=None):
+    '''
+    trading calendar of an exchange, built once from the holiday rules and tables
+    * exchange: 'KRX', 'NYSE', 'NASDAQ', 'AMEX', 'SSE', 'SZSE', 'HKEX', 'TSE', 'HOSE'
+    * start_year, end_year: years covered by the holidays (end_year default: next year)
+    holidays of the lunar calendar are tabled for 2015 ~ 2030 (a lookup out of the tabled years warns for
+    KRX, SSE, SZSE, HKEX and HOSE), and special closures are not included:
+    use TradingCalendar.from_history for exact past sessions
+    '''
+    exchange = exchange.upper()
+    if exchange not in _holiday_rules:
+        raise NotImplementedError(f"exchange='{exchange}' is not supported. use one of {list(_holiday_rules)}")
+    end_year = end_year or date.today().year + 1
+    key = (exchange, start_year, end_year)
+    with _calendars_lock:
+        if key not in _calendars:
+            rule = _holiday_rules[exchange]
+            holidays = [d for year in range(start_year, end_year + 1) for d in rule(year)]
+            first, last = start_year, end_year
+            if exchange in _lunar_exchanges:
+                first, last = max(first, min(_lunar)), min(last, max(_lunar))
+            _calendars[key] = TradingCalendar(holidays, name=exchange, start=date(first, 1, 1),
+                                              end=date(last, 12, 31))
+        return _calendars[key]
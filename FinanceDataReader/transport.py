@@ -0,0 +1,307 @@
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from FinanceDataReader._cache import (ResponseCache, MemoryCache, DiskCache, CachedResponse, _cache_key)
+
+cloudscraper_install_msg = '''
+cloudscraper not installed. please install as follows
+
+일부 사이트(investing.com, choicestock.co.kr)를 읽으려면 cloudscraper 에 의존성이 있습니다.
+다음과 같이 cloudscraper를 설치하세요
+
+pip install cloudscraper
+
+'''
+
+
+def _retry_after(headers):
+    # Retry-After: 초 단위 숫자 또는 HTTP-date
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0., float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0., parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_throttled(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+def _should_retry(status_code):
+    return status_code in [429, 502, 503, 504]
+
+
+class RateLimiter:
+    '''
+    per-host token bucket shared by the sync and the async transports (thread-safe, never blocks while locked)
+    * rate: sustained requests per second of each host (None: unlimited)
+    * burst: number of requests allowed at once after an idle period
+    * host_rates: {host: (rate, burst)} overriding rate and burst of some hosts
+    * min_rate: lower bound of the rate while slowing down
+    * recovery: fraction of the configured rate given back on each successful response
+    * clock: monotonic clock in seconds (default: time.monotonic)
+    the rate of a host is halved on 429/5xx and the host is paused for Retry-After (or one request interval)
+    '''
+    default_host_rates = {
+        'fchart.stock.naver.com': (30, 60),  # KRX 가격: DataReaderMany 가 종목마다 한 번 요청
+        'api.investing.com': (1, 2),
+        'iappapi.investing.com': (1, 2),
+        'www.choicestock.co.kr': (2, 4),
+        'navercomp.wisereport.co.kr': (4, 8),
+        'data.krx.co.kr': (4, 8),
+        'kind.krx.co.kr': (2, 4),
+    }
+
+    def __init__(self, rate=10., burst=20, host_rates=None, min_rate=0.2, recovery=0.1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.host_rates = dict(self.default_host_rates)
+        self.host_rates.update(host_rates or {})
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self.clock = clock
+        self._buckets = {}  # host -> {'tokens', 'last', 'rate', 'resume'}
+        self._lock = threading.Lock()
+
+    def _limits(self, host):
+        return self.host_rates.get(host, (self.rate, self.burst))
+
+    def _bucket(self, host, now):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self._limits(host)
+            bucket = self._buckets[host] = {'tokens': float(burst), 'last': now, 'rate': float(rate), 'resume': now}
+        return bucket
+
+    def set_rate(self, host, rate, burst=None):
+        '''
+        change rate (requests per second) and burst of a host
+        '''
+        with self._lock:
+            self.host_rates[host] = (rate, burst if burst is not None else max(1, int(rate * 2)))
+            self._buckets.pop(host, None)
+
+    def reserve(self, host):
+        '''
+        take a token of host and return the seconds to wait before sending the request
+        '''
+        now = self.clock()
+        with self._lock:
+            rate, burst = self._limits(host)
+            if not rate:
+                return 0.
+            bucket = self._bucket(host, now)
+            bucket['tokens'] = min(burst, bucket['tokens'] + (now - bucket['last']) * bucket['rate'])
+            bucket['last'] = now
+            bucket['tokens'] -= 1.
+            wait = -bucket['tokens'] / bucket['rate'] if bucket['tokens'] < 0 else 0.
+            return max(wait, bucket['resume'] - now)
+
+    def acquire(self, host):
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    def feedback(self, host, status_code, retry_after=None):
+        '''
+        adapt the rate of host to the status of a response: slow down on 429/5xx, recover on success
+        '''
+        now = self.clock()
+        with self._lock:
+            rate, _ = self._limits(host)
+            if not rate:
+                return
+            bucket = self._bucket(host, now)
+            if _is_throttled(status_code):
+                bucket['rate'] = max(self.min_rate, bucket['rate'] / 2)
+                pause = retry_after if retry_after is not None else 1. / bucket['rate']
+                bucket['resume'] = max(bucket['resume'], now + pause)
+            else:
+                bucket['rate'] = min(float(rate), bucket['rate'] + rate * self.recovery)
+
+
+class Transport:
+    '''
+    pooled keep-alive HTTP transport shared by all readers and listings (one session per host)
+    * pool_size: number of connections kept alive per host
+    * timeout: default timeout (seconds) of each request
+    * headers: default headers sent with every request
+    * limiter: RateLimiter of the requests (None: the shared one, see get_rate_limiter)
+    * max_retries: number of retries of a request answered with 429, 502, 503, 504
+    '''
+    def __init__(self, pool_size=10, timeout=30, headers=None, limiter=None, max_retries=3):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def _mount(self, session):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def _new_session(self, browser=None):
+        if browser is None:
+            return self._mount(requests.Session())
+        try:
+            import cloudscraper
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError(cloudscraper_install_msg)
+        scraper = cloudscraper.create_scraper(browser={'browser': browser, 'platform': 'windows', 'mobile': False})
+        return self._mount(scraper)
+
+    def session(self, url, browser=None):
+        '''
+        session for the host of url
+        * browser: 'chrome', 'firefox' to get a cloudscraper session emulating the browser
+        '''
+        key = (urlsplit(url).netloc, browser)
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = self._new_session(browser)
+            return self._sessions[key]
+
+    def request(self, method, url, browser=None, cache_ttl=None, **kwargs):
+        '''
+        * cache_ttl: seconds a response of this endpoint stays fresh in the response cache (None: not cached)
+        '''
+        cache = get_response_cache() if cache_ttl else None
+        if cache is None:
+            return self._send(method, url, browser, **kwargs)
+
+        key = _cache_key(method, url, kwargs.get('data'), kwargs.get('params'))
+        entry = cache.get(key)
+        if entry is not None:
+            if cache.is_fresh(entry, cache_ttl):
+                return CachedResponse(entry)
+            conditional = cache.conditional_headers(entry)
+            if conditional:
+                kwargs['headers'] = dict(kwargs.get('headers') or {}, **conditional)
+        r = self._send(method, url, browser, **kwargs)
+        if r.status_code == 304 and entry is not None:
+            return CachedResponse(cache.touch(key, entry))
+        if r.status_code == 200:
+            cache.store(key, r.status_code, r.headers, r.content, r.encoding or r.apparent_encoding, r.url)
+        return r
+
+    def _send(self, method, url, browser=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.session(url, browser)
+        limiter = self.limiter or get_rate_limiter()
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire(host)
+            r = session.request(method, url, **kwargs)
+            limiter.feedback(host, r.status_code, _retry_after(r.headers))
+            if not _should_retry(r.status_code) or attempt == self.max_retries:
+                return r
+            r.close()  # 다음 시도는 limiter 가 정한 만큼(Retry-After) 기다린 뒤 보냄
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request('POST', url, data=data, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+_limiter = RateLimiter()
+_cache = ResponseCache([MemoryCache()])
+_transport = Transport()
+
+
+def get_response_cache():
+    return _cache
+
+
+def set_response_cache(cache):
+    '''
+    replace the response cache (None: no caching)
+    ex: set_response_cache(ResponseCache([MemoryCache(256), DiskCache('~/.fdr_cache/http')]))
+    '''
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
+
+
+def clear_cache():
+    if _cache is not None:
+        _cache.clear()
+
+
+def get_rate_limiter():
+    return _limiter
+
+
+def set_rate_limit(host, rate, burst=None):
+    '''
+    change the requests per second (and burst) allowed to a host, ex: set_rate_limit('fchart.stock.naver.com', 60)
+    '''
+    _limiter.set_rate(host, rate, burst)
+
+
+def get_transport():
+    return _transport
+
+
+def set_transport(transport):
+    '''
+    replace the transport used by every reader (ex: a local fake in tests)
+    transport must provide get(url, **kwargs) and post(url, data=None, **kwargs)
+    '''
+    global _transport
+    previous, _transport = _transport, transport
+    return previous
+
+
+def configure(pool_size=10, timeout=30, headers=None, rate=10., burst=20, host_rates=None, max_retries=3,
+              cache_size=128, cache_dir=None):
+    '''
+    replace the default transport, rate limiter and response cache with new ones
+    * pool_size: number of connections kept alive per host
+    * timeout: default timeout (seconds) of each request
+    * headers: default headers sent with every request
+    * rate, burst: requests per second and burst allowed to each host (rate=None: unlimited)
+    * host_rates: {host: (rate, burst)} overriding rate and burst of some hosts
+    * max_retries: number of retries of a request answered with 429, 502, 503, 504
+    * cache_size: number of responses kept in memory (0: no caching)
+    * cache_dir: directory of the on-disk response cache, shared by processes (None: memory only),
+      the 1024 most recently used responses are kept
+    '''
+    global _limiter
+    _limiter = RateLimiter(rate, burst, host_rates)
+    backends = [MemoryCache(cache_size)] if cache_size else []
+    if cache_dir:
+        backends.append(DiskCache(cache_dir))
+    set_response_cache(ResponseCache(backends) if backends else None)
+    previous = set_transport(Transport(pool_size, timeout, headers, max_retries=max_retries))
+    if isinstance(previous, Transport):
+        previous.close()
+    return _transport
+
+
+def get(url, **kwargs):
+    return _transport.get(url, **kwargs)
+
+
+def post(url, data=None, **kwargs):
+    return _transport.post(url, data=data, **kwargs)
@@ -1,12 +1,20 @@
 import pandas as pd
+from io import BytesIO
+from FinanceDataReader import transport
 
 class WikipediaStockListing:
+    url = 'https://en.wikipedia.org/wiki/List_of_S&P_500_companies'
+    cache_ttl = 24 * 3600
+
     def __init__(self, market):
         self.market = market
-    
+
     def read(self):
-        url = 'https://en.wikipedia.org/wiki/List_of_S&P_500_companies'
-        df = pd.read_html(url, header=0)[0]
+        return self._parse(transport.get(self.url, cache_ttl=self.cache_ttl).content)
+
+    @staticmethod
+    def _parse(content):
+        df = pd.read_html(BytesIO(content), header=0)[0]
         cols_ren = {'Security':'Name', 'Ticker symbol':'Symbol', 'GICS Sector':'Sector', 'GICS Sub-Industry':'Industry'}
         df = df.rename(columns = cols_ren)
         df = df[['Symbol', 'Name', 'Sector', 'Industry']]
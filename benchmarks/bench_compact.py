@@ -0,0 +1,47 @@
+'''
+memory of daily prices with and without _compact
+python -m benchmarks.bench_compact [symbols]
+'''
+import sys
+import time
+import numpy as np
+import pandas as pd
+from FinanceDataReader._utils import _compact
+
+
+def daily_prices(symbols, days=5000, seed=0):
+    # NaverDailyReader 의 일봉과 같은 모양(DatetimeIndex, int64 가격/거래량, float64 Change)을 종목 수만큼 이어 붙임
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2000-01-03', periods=days, name='Date')
+    frames = []
+    for _ in range(symbols):
+        walk = np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        close = (walk / walk.max() * rng.integers(1_000, 1_000_000)).round().astype(np.int64) + 100
+        df = pd.DataFrame({
+            'Open': close + rng.integers(-50, 50, days),
+            'High': close + rng.integers(0, 100, days),
+            'Low': close - rng.integers(0, 100, days),
+            'Close': close,
+            'Volume': rng.integers(0, 50_000_000, days),
+        }, index=dates)
+        df['Change'] = df['Close'].pct_change()
+        frames.append(df)
+    return pd.concat(frames)
+
+
+def main(symbols=200):
+    df = daily_prices(symbols)
+    rows = len(df)
+    t0 = time.perf_counter()
+    compact = _compact(df)
+    elapsed = time.perf_counter() - t0
+    before = df.memory_usage(index=True, deep=True).sum()
+    after = compact.memory_usage(index=True, deep=True).sum()
+    print(f'rows: {rows:,}  _compact: {elapsed * 1000:.1f} ms')
+    print(f'bytes/row: {before / rows:.1f} -> {after / rows:.1f}')
+    print(f'total: {before / 2 ** 20:.1f} MiB -> {after / 2 ** 20:.1f} MiB')
+    print(dict(compact.dtypes.astype(str)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
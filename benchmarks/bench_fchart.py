@@ -0,0 +1,60 @@
+'''
+parse time of a 6000-bar fchart response: _parse_fchart vs the former findall -> join -> read_csv path
+python -m benchmarks.bench_fchart [saved response]
+without a saved response, a payload in the fchart format (6000 daily bars of 005930) is generated
+'''
+import re
+import sys
+import timeit
+from io import StringIO
+import numpy as np
+import pandas as pd
+from FinanceDataReader.naver.data import NaverDailyReader, _parse_fchart
+
+
+def fchart_payload(bars=6000, seed=0):
+    # fchart.stock.naver.com/sise.nhn?timeframe=day&count=6000 응답과 같은 형식 (EUC-KR xml)
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end='2024-12-30', periods=bars).strftime('%Y%m%d')
+    close = (np.exp(np.cumsum(rng.normal(0, 0.02, bars))) * 20000).round().astype(np.int64) + 100
+    lines = ['<?xml version="1.0" encoding="EUC-KR" ?>', '<protocol>',
+             f'<chartdata symbol="005930" name="" count="{bars}" timeframe="day" precision="0" origintime="19900103">']
+    for d, c, o, v in zip(dates, close, rng.integers(-50, 50, bars), rng.integers(0, 50_000_000, bars)):
+        lines.append(f'\t\t<item data="{d}|{c + o}|{c + abs(o)}|{c - abs(o)}|{c}|{v}" />')
+    lines += ['</chartdata>', '</protocol>']
+    return '\n'.join(lines).encode('euc-kr')
+
+
+def parse_read_csv(content):
+    # 이전 방식: 정규식으로 item 을 찾아 이어 붙인 뒤 read_csv
+    data_list = re.findall('<item data=\"(.*?)\" />', content.decode('euc-kr'), re.DOTALL)
+    df = pd.read_csv(StringIO('\n'.join(data_list)), delimiter='|', header=None, dtype={0: str})
+    df.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y%m%d')
+    df.set_index('Date', inplace=True)
+    df.sort_index(inplace=True)
+    return df
+
+
+def parse_fchart(content):
+    return NaverDailyReader('005930')._frame(_parse_fchart(content))
+
+
+def main(path=None, repeat=20):
+    if path:
+        with open(path, 'rb') as f:
+            content = f.read()
+    else:
+        content = fchart_payload()
+
+    old, new = parse_read_csv(content), parse_fchart(content)
+    pd.testing.assert_frame_equal(old, new, check_dtype=False, check_index_type=False, check_freq=False)
+
+    print(f'bars: {len(new):,}  payload: {len(content) / 1024:.0f} KiB')
+    for name, func in [('findall + read_csv', parse_read_csv), ('_parse_fchart', parse_fchart)]:
+        best = min(timeit.repeat(lambda: func(content), number=1, repeat=repeat))
+        print(f'{name:>20}: {best * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
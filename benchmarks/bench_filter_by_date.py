@@ -0,0 +1,46 @@
+'''
+date slicing of cached histories: _filter_by_date (searchsorted) vs the former DataFrame.query
+python -m benchmarks.bench_filter_by_date
+'''
+import timeit
+import numpy as np
+import pandas as pd
+from FinanceDataReader._utils import _filter_by_date
+
+
+def history(freq, periods, seed=0):
+    # ColumnarStore 에 저장된 가격과 같은 모양 (정렬된 DatetimeIndex, OHLCV)
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('1995-01-02', periods=periods, freq=freq, name='Date')
+    close = rng.integers(1_000, 100_000, periods)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                         'Volume': rng.integers(0, 1_000_000, periods)}, index=index)
+
+
+def filter_by_query(df, start, end):
+    # 이전 방식, 최신 pandas 의 query 는 Timestamp(...) 의 repr 을 해석하지 못하므로 날짜 문자열로
+    date_query = 'index>=%r and index<=%r'
+    return df.query(date_query % (str(start), str(end)))
+
+
+def main(repeat=20):
+    daily, minute = history('B', 7_800), history('min', 190_000)  # 일봉 30년, 분봉 약 2년치(하루 390 개)
+    cases = [
+        # (이름, 가격, 기간, 반복 횟수: KRX 전 종목 캐시에서 같은 기간을 자르는 경우는 종목 수만큼)
+        ('daily, 30 years', daily, ('2020-01-01', '2024-06-30'), 1),
+        ('minute, 190k bars', minute, ('1995-03-01', '1995-03-31'), 1),
+        ('daily x 2,500 symbols', daily, ('2023-01-02', '2023-12-29'), 2_500),
+    ]
+    for name, df, (start, end), number in cases:
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        pd.testing.assert_frame_equal(filter_by_query(df, start, end), _filter_by_date(df, start, end))
+        times = {}
+        for label, func in [('query', filter_by_query), ('searchsorted', _filter_by_date)]:
+            times[label] = min(timeit.repeat(lambda: func(df, start, end), number=number,
+                                             repeat=repeat if number == 1 else 3))
+        print(f'{name:>22} ({len(df):,} rows): query {times["query"] * 1000:.2f} ms, '
+              f'searchsorted {times["searchsorted"] * 1000:.2f} ms ({times["query"] / times["searchsorted"]:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import os
+import re
+import json
+import asyncio
+import pytest
+from FinanceDataReader import aio
+from FinanceDataReader.aio import AsyncResponse
+from FinanceDataReader.krx.data import KrxDelistingReader
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class _FakeAsyncTransport:
+    # aio.set_transport 로 바꿔 끼우는 가짜 transport: handler(method, url, data) 가 응답 본문(bytes)을 만듦
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    async def get(self, url, **kwargs):
+        return self._respond('GET', url, None)
+
+    async def post(self, url, data=None, **kwargs):
+        return self._respond('POST', url, data)
+
+    def _respond(self, method, url, data):
+        self.calls.append((method, url, data))
+        return AsyncResponse(200, {}, self.handler(method, url, data))
+
+
+@pytest.fixture
+def fake_transport():
+    previous = aio.get_transport()
+
+    def install(handler):
+        fake = _FakeAsyncTransport(handler)
+        aio.set_transport(fake)
+        return fake
+    yield install
+    aio.set_transport(previous)
+
+
+@pytest.fixture
+def delisting_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(KrxDelistingReader, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(KrxDelistingReader, '_full_codes', {'date': None, 'codes': {}})
+    return tmp_path
+
+
+def _delisting_handler(method, url, data):
+    if data['bld'] == 'dbms/comm/finder/finder_listdelisu':
+        return json.dumps({'block1': [{'short_code': '036360', 'full_code': 'KR7036360009'}]}).encode()
+    assert data['isuCd'] == 'KR7036360009'
+    with open(os.path.join(fixtures, 'krx', 'delisting_prices.json'), 'rb') as f:
+        return f.read()
+
+
+def test_delisting_reader_downloads_the_map_once(fake_transport, delisting_cache):
+    fake = fake_transport(_delisting_handler)
+    for _ in range(2):
+        df = asyncio.run(aio.DataReader('036360', '2019-03-01', '2019-03-31', exchange='KRX-DELISTING'))
+        assert df['Close'].tolist() == [1250, 1300, 1280]
+    finders = [data for _, _, data in fake.calls if data['bld'] == 'dbms/comm/finder/finder_listdelisu']
+    assert len(finders) == 1
+    assert (delisting_cache / 'krx' / 'delisting_full_codes.json').exists()
+
+
+def test_delisting_reader_unknown_symbol(fake_transport, delisting_cache):
+    fake_transport(_delisting_handler)
+    with pytest.raises(ValueError, match='not found'):
+        asyncio.run(aio.DataReader('000000', exchange='KRX-DELISTING'))
+
+
+def test_locked_store_keeps_the_map_stored_meanwhile(delisting_cache):
+    stored = KrxDelistingReader._locked_store_full_codes(json.dumps({'block1': [{'short_code': 'A', 'full_code': 'KRA'}]}))
+    again = KrxDelistingReader._locked_store_full_codes(json.dumps({'block1': [{'short_code': 'B', 'full_code': 'KRB'}]}))
+    assert stored == again == {'A': 'KRA'}
+    assert KrxDelistingReader._locked_cached_full_codes() == {'A': 'KRA'}
+
+
+def test_naver_listing_reads_every_page(fake_transport):
+    stocks = [{'symbolCode': f'S{i}', 'stockNameEng': f'Stock {i}',
+               'industryCodeType': {'industryGroupKor': '기술', 'code': '57'}} for i in range(130)]
+
+    def handler(method, url, data):
+        page, size = (int(v) for v in re.search(r'page=(\d+)&pageSize=(\d+)', url).groups())
+        return json.dumps({'totalCount': len(stocks), 'stocks': stocks[(page - 1) * size:page * size]}).encode()
+
+    fake = fake_transport(handler)
+    df = asyncio.run(aio.StockListing('NYSE'))
+    assert len(fake.calls) == 3
+    assert list(df.columns) == ['Symbol', 'Name', 'Industry', 'IndustryCode']
+    assert df['Symbol'].tolist() == [f'S{i}' for i in range(130)]
@@ -0,0 +1,110 @@
+import os
+import time
+import requests
+from FinanceDataReader import transport
+from FinanceDataReader._cache import ResponseCache, MemoryCache, DiskCache, CachedResponse
+from FinanceDataReader.transport import Transport, RateLimiter
+
+
+def _entry(stored=None, headers=None, content=b'body'):
+    return {'status_code': 200, 'headers': headers or {}, 'content': content, 'encoding': 'utf-8',
+            'url': 'https://example.com/', 'stored': time.time() if stored is None else stored}
+
+
+def test_is_fresh():
+    assert ResponseCache.is_fresh(_entry(), 60)
+    assert not ResponseCache.is_fresh(_entry(time.time() - 61), 60)
+
+
+def test_conditional_headers():
+    cache = ResponseCache()
+    entry = cache.store('k', 200, {'etag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}, b'', 'utf-8',
+                        'https://example.com/')
+    assert ResponseCache.conditional_headers(entry) == {'If-None-Match': '"v1"',
+                                                        'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+    assert ResponseCache.conditional_headers(_entry()) == {}
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # a 가 최근 사용
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_disk_cache_keeps_max_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=2)
+    for i, key in enumerate(['a', 'b']):
+        cache.set(key, _entry(content=key.encode()))
+        os.utime(cache._file(key), (1000 + i, 1000 + i))
+    assert cache.get('a')['content'] == b'a'  # a 를 읽으면 b 가 가장 오래 전에 사용됨
+    cache.set('c', _entry(content=b'c'))
+    assert sorted(os.listdir(tmp_path)) == ['a.pkl', 'c.pkl']
+    assert cache.get('b') is None
+
+
+def test_disk_hit_is_copied_to_memory(tmp_path):
+    memory, disk = MemoryCache(), DiskCache(str(tmp_path))
+    disk.set('k', _entry())
+    cache = ResponseCache([memory, disk])
+    assert cache.get('k')['content'] == b'body'
+    assert memory.get('k')['content'] == b'body'
+
+
+class _FakeSession:
+    # 첫 요청은 ETag 와 함께 200, If-None-Match 가 같으면 304
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        headers = kwargs.get('headers') or {}
+        self.requests.append(headers)
+        r = requests.Response()
+        r.url, r.encoding = url, 'utf-8'
+        if headers.get('If-None-Match') == '"v1"':
+            r.status_code, r._content = 304, b''
+        else:
+            r.status_code, r._content = 200, b'payload'
+            r.headers['ETag'] = '"v1"'
+        return r
+
+
+def _transport(monkeypatch, cache):
+    monkeypatch.setattr(transport, '_cache', cache)
+    t = Transport(limiter=RateLimiter(rate=None))
+    session = _FakeSession()
+    monkeypatch.setattr(t, 'session', lambda url, browser=None: session)
+    return t, session
+
+
+def test_fresh_entry_is_served_without_request(monkeypatch):
+    t, session = _transport(monkeypatch, ResponseCache([MemoryCache()]))
+    assert t.get('https://example.com/a', cache_ttl=60).content == b'payload'
+    r = t.get('https://example.com/a', cache_ttl=60)
+    assert isinstance(r, CachedResponse) and r.text == 'payload'
+    assert len(session.requests) == 1
+
+
+def test_stale_entry_is_revalidated_and_touched_on_304(monkeypatch):
+    cache = ResponseCache([MemoryCache()])
+    t, session = _transport(monkeypatch, cache)
+    t.get('https://example.com/a', cache_ttl=60)
+    key, entry = next(iter(cache.backends[0]._entries.items()))
+    cache.set(key, dict(entry, stored=time.time() - 120))  # ttl 이 지남
+
+    r = t.get('https://example.com/a', cache_ttl=60)
+    assert session.requests[-1]['If-None-Match'] == '"v1"'
+    assert isinstance(r, CachedResponse) and r.content == b'payload'
+    assert ResponseCache.is_fresh(cache.get(key), 60)  # 304 로 저장 시각만 갱신
+    t.get('https://example.com/a', cache_ttl=60)
+    assert len(session.requests) == 2
+
+
+def test_no_cache_ttl_is_not_cached(monkeypatch):
+    t, session = _transport(monkeypatch, ResponseCache([MemoryCache()]))
+    t.get('https://example.com/a')
+    t.get('https://example.com/a')
+    assert len(session.requests) == 2
@@ -0,0 +1,41 @@
+import os
+import pandas as pd
+import pytest
+from FinanceDataReader import data as fdr_data
+from FinanceDataReader.krx.data import KrxDelistingReader
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+@pytest.fixture
+def delisting(monkeypatch):
+    # DataReader(..., exchange='KRX-DELISTING') 대신 저장된 응답을 KrxDelistingReader 로 파싱
+    with open(os.path.join(fixtures, 'krx', 'delisting_prices.json'), encoding='utf-8') as f:
+        text = f.read()
+
+    def _read(symbol, *args):
+        return KrxDelistingReader(symbol)._parse(text)
+
+    monkeypatch.setattr(fdr_data, 'DataReader', _read)
+
+
+def test_many_long_delisting_is_indexed_by_symbol_and_date(delisting):
+    df = fdr_data.DataReaderMany(['036360', '000000'], exchange='KRX-DELISTING', output='long')
+    assert df.index.names == ['Symbol', 'Date']
+    dates = df.loc['036360'].index
+    assert isinstance(dates, pd.DatetimeIndex)
+    assert list(dates) == list(pd.to_datetime(['2019-03-27', '2019-03-28', '2019-03-29']))
+    assert df.loc[('036360', pd.Timestamp('2019-03-29')), 'Close'] == 1250
+
+
+def test_many_dict_delisting_is_indexed_by_date(delisting):
+    dfs = fdr_data.DataReaderMany(['036360'], exchange='KRX-DELISTING')
+    assert isinstance(dfs['036360'].index, pd.DatetimeIndex)
+    assert 'Date' not in dfs['036360'].columns
+
+
+def test_many_panel_delisting_is_aligned_by_date(delisting):
+    panel = fdr_data.DataReaderMany(['036360'], exchange='KRX-DELISTING', output='panel', fields=['Close', 'Volume'])
+    close = panel['Close']
+    assert list(close.index) == list(pd.to_datetime(['2019-03-27', '2019-03-28', '2019-03-29']))
+    assert close['036360'].tolist() == [1280., 1300., 1250.]
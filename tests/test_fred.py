@@ -0,0 +1,59 @@
+from urllib.parse import urlsplit, parse_qs
+import requests
+import pandas as pd
+from FinanceDataReader.fred import data as fred_data
+from FinanceDataReader.fred.data import FredReader
+
+
+def _stub_fred(monkeypatch, series, calls):
+    # fredgraph.csv: id 의 각 시리즈를 cosd 부터 응답
+    def get(url, **kw):
+        query = parse_qs(urlsplit(url).query)
+        ids, starts = query['id'][0].split(','), query['cosd'][0].split(',')
+        calls.append(dict(zip(ids, starts)))
+        frame = pd.concat([series[sym][series[sym].index >= start].rename(sym) for sym, start in zip(ids, starts)],
+                          axis=1, sort=True)
+        r = requests.Response()
+        r.status_code, r.url = 200, url
+        r._content = frame.to_csv(index_label='observation_date', na_rep='.').encode()
+        r.headers['content-disposition'] = 'attachment; filename="fredgraph.csv"'
+        return r
+    monkeypatch.setattr(fred_data.transport, 'get', get)
+
+
+def _series(dates, values):
+    return pd.Series(values, index=pd.DatetimeIndex(pd.to_datetime(dates)), dtype=float)
+
+
+def test_read_without_store(monkeypatch):
+    calls = []
+    _stub_fred(monkeypatch, {'DFF': _series(['2024-01-01', '2024-01-02'], [5.33, 5.33])}, calls)
+    df = FredReader('DFF', '2024-01-01', '2024-01-31').read()
+    assert calls == [{'DFF': '2024-01-01'}]
+    assert df['DFF'].tolist() == [5.33, 5.33]
+
+
+def test_store_fetches_only_new_observations(monkeypatch, tmp_path):
+    calls = []
+    _stub_fred(monkeypatch, {'GDP': _series(['2023-07-01', '2023-10-01'], [27610., 27957.]),
+                             'UNRATE': _series(['2023-11-01', '2023-12-01'], [3.7, 3.7])}, calls)
+    df = FredReader(['GDP', 'UNRATE'], '2023-01-01', cache_dir=str(tmp_path)).read()
+    assert calls == [{'GDP': '1776-07-04', 'UNRATE': '1776-07-04'}]
+    assert df.loc['2023-10-01', 'GDP'] == 27957.
+
+    # 마지막 관측일(수정될 수 있음)부터만 요청하고, 수정된 값과 새 관측값을 저장된 시리즈에 합침
+    _stub_fred(monkeypatch, {'GDP': _series(['2023-10-01', '2024-01-01'], [27958., 28269.]),
+                             'UNRATE': _series(['2023-12-01', '2024-01-01'], [3.7, 3.7])}, calls)
+    df = FredReader(['GDP', 'UNRATE'], '2023-01-01', cache_dir=str(tmp_path)).read()
+    assert calls[-1] == {'GDP': '2023-10-01', 'UNRATE': '2023-12-01'}
+    assert FredReader(['GDP'], cache_dir=str(tmp_path)).store.load('GDP').iloc[:, 0].tolist() == [27610., 27958., 28269.]
+    assert df.loc['2024-01-01', 'UNRATE'] == 3.7
+    assert df.loc['2023-07-01', 'GDP'] == 27610.
+
+
+def test_refresh_downloads_the_whole_history(monkeypatch, tmp_path):
+    calls = []
+    _stub_fred(monkeypatch, {'DFF': _series(['2024-01-01', '2024-01-02'], [5.33, 5.33])}, calls)
+    FredReader('DFF', cache_dir=str(tmp_path)).read()
+    FredReader('DFF', cache_dir=str(tmp_path), refresh=True).read()
+    assert calls == [{'DFF': '1776-07-04'}, {'DFF': '1776-07-04'}]
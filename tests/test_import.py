@@ -0,0 +1,38 @@
+import os
+import sys
+import json
+import subprocess
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+heavy = ['pandas', 'numpy', 'requests', 'cloudscraper', 'bs4', 'lxml', 'selenium', 'aiohttp', 'plotly', 'matplotlib']
+
+
+def _import_in_subprocess(statement):
+    # 새 인터프리터에서 import 시간과 로드된 모듈을 측정
+    code = (
+        'import sys, time, json\n'
+        'before = set(sys.modules)\n'
+        't0 = time.perf_counter()\n'
+        f'{statement}\n'
+        'elapsed = time.perf_counter() - t0\n'
+        'print(json.dumps({"elapsed": elapsed, "modules": sorted(set(sys.modules) - before)}))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_bare_import_loads_only_the_package():
+    result = _import_in_subprocess('import FinanceDataReader')
+    modules = result['modules']
+    assert [m for m in modules if m.split('.')[0] == 'FinanceDataReader'] == ['FinanceDataReader']
+    assert not [m for m in modules if m.split('.')[0] in heavy]
+
+
+def test_bare_import_is_fast():
+    assert _import_in_subprocess('import FinanceDataReader')['elapsed'] < 0.1
+
+
+def test_data_functions_load_on_first_use():
+    result = _import_in_subprocess('import FinanceDataReader as fdr; fdr.DataReader')
+    assert 'FinanceDataReader.data' in result['modules']
+    assert 'selenium' not in result['modules']
@@ -0,0 +1,72 @@
+import json
+import threading
+import pytest
+import pandas as pd
+from FinanceDataReader.investing.data import InvestingDailyReader
+
+
+@pytest.fixture
+def currid_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(InvestingDailyReader, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(InvestingDailyReader, '_currid_cache', {})
+    monkeypatch.setattr(InvestingDailyReader, '_currid_loaded', False)
+    return tmp_path
+
+
+def test_pair_id_is_searched_once_and_persisted(monkeypatch, currid_cache):
+    searches = []
+    monkeypatch.setattr(InvestingDailyReader, '_search_currid_investing',
+                        lambda self, symbol, exchange=None: searches.append(symbol) or 6408)
+    reader = InvestingDailyReader('AAPL')
+    assert reader._get_currid_investing('AAPL') == 6408
+    assert reader._get_currid_investing('aapl') == 6408
+    assert searches == ['AAPL']
+    with open(currid_cache / 'investing' / 'pair_ids.json', encoding='utf-8') as f:
+        assert json.load(f) == {'AAPL|': 6408}
+
+    # 새 프로세스(메모리가 비어 있음)는 디스크에서 읽음
+    monkeypatch.setattr(InvestingDailyReader, '_currid_cache', {})
+    monkeypatch.setattr(InvestingDailyReader, '_currid_loaded', False)
+    assert reader._get_currid_investing('AAPL') == 6408
+    assert reader._get_currid_investing('AAPL', 'NASDAQ') == 6408
+    assert searches == ['AAPL', 'AAPL']  # 거래소가 다르면 다른 키
+
+
+def _page(days):
+    # get_screen.php 의 data 와 같은 형식 (최근 날짜부터)
+    days = sorted(days, reverse=True)
+    return pd.DataFrame({'date': pd.DatetimeIndex(days), 'price': ['1,000.5'] * len(days),
+                         'open': ['1,000'] * len(days), 'high': ['1,001'] * len(days), 'low': ['999'] * len(days),
+                         'vol': ['1.5M'] * len(days), 'perc_chg': ['0.25%'] * len(days)})
+
+
+def test_long_period_is_read_in_concurrent_windows(monkeypatch, currid_cache):
+    monkeypatch.setattr(InvestingDailyReader, 'window_days', 365)
+    monkeypatch.setattr(InvestingDailyReader, '_search_currid_investing', lambda self, symbol, exchange=None: 1)
+    requests, lock = [], threading.Lock()
+
+    def fetch_page(self, curr_id, start, end):
+        # 한 응답은 요청 기간의 최근 100 영업일만 담음
+        with lock:
+            requests.append((start, end))
+        return _page(pd.bdate_range(start, end)[-100:])
+    monkeypatch.setattr(InvestingDailyReader, '_fetch_page', fetch_page)
+
+    reader = InvestingDailyReader('AAPL', '2020-01-01', '2022-12-31')
+    df = reader.read()
+    assert list(df.index) == list(pd.bdate_range('2020-01-01', '2022-12-31'))
+    windows = reader._windows(pd.Timestamp('2020-01-01'), pd.Timestamp('2022-12-31'))
+    assert len(windows) == 4 and set(windows) <= set(requests)  # 365일 구간 (2020 년은 366일)
+    assert len(requests) > len(windows)  # 각 구간의 남은 앞부분을 이어서 요청
+    assert df['Close'].iloc[0] == 1000.5
+    assert df['Volume'].iloc[0] == 1.5e6
+    assert df['Change'].iloc[0] == 0.0025
+
+
+def test_windows_cover_the_period():
+    reader = InvestingDailyReader('AAPL')
+    reader.window_days = 10
+    windows = reader._windows(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-25'))
+    assert windows == [(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-10')),
+                       (pd.Timestamp('2024-01-11'), pd.Timestamp('2024-01-20')),
+                       (pd.Timestamp('2024-01-21'), pd.Timestamp('2024-01-25'))]
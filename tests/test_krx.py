@@ -0,0 +1,152 @@
+import json
+import time
+import pytest
+import requests
+import pandas as pd
+from FinanceDataReader.krx import data as krx_data
+from FinanceDataReader.krx import listing as krx_listing
+from FinanceDataReader.krx.data import KrxDelistingReader
+from FinanceDataReader.krx.listing import KrxMarcapListing, KrxStockListing
+
+
+def _marcap_row(code, close):
+    return {'ISU_SRT_CD': code, 'ISU_ABBRV': f'종목{code}', 'TDD_CLSPRC': f'{close:,}', 'SECT_TP_NM': '',
+            'FLUC_TP_CD': '1', 'CMPPREVDD_PRC': '100', 'FLUC_RT': '0.50', 'ACC_TRDVOL': '1,000',
+            'ACC_TRDVAL': '10,000,000', 'TDD_OPNPRC': f'{close:,}', 'TDD_HGPRC': f'{close:,}',
+            'TDD_LWPRC': f'{close:,}', 'MKTCAP': '1,000,000,000', 'LIST_SHRS': '10,000', 'MKT_NM': 'KOSPI',
+            'MKT_ID': 'STK'}
+
+
+def _response(status_code, content=b''):
+    r = requests.Response()
+    r.status_code, r._content, r.url = status_code, content, KrxMarcapListing.url
+    return r
+
+
+def _stub_post(failing, calls):
+    # trdDd 가 failing 에 있는 날은 항상 500, 나머지는 종목 2개
+    def post(url, data=None, **kw):
+        calls.append(data['trdDd'])
+        if data['trdDd'] in failing:
+            raise requests.HTTPError(f"500 Server Error: {data['trdDd']}", response=_response(500))
+        rows = [_marcap_row('005930', 70000), _marcap_row('000660', 130000)]
+        return _response(200, json.dumps({'OutBlock_1': rows}).encode())
+    return post
+
+
+def test_read_range_keeps_the_days_that_succeeded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(krx_listing.transport, 'post', _stub_post({'20240103'}, calls))
+    with pytest.warns(UserWarning, match=r'1 of 4 days failed: 20240103\(HTTPError'):
+        panel = KrxMarcapListing('KRX-MARCAP').read_range('2024-01-02', '2024-01-05', max_workers=2)
+    assert calls.count('20240103') == 3  # 처음 + 재시도 2번
+    dates = panel.index.get_level_values('Date').unique()
+    assert list(dates) == list(pd.to_datetime(['2024-01-02', '2024-01-04', '2024-01-05']))
+    assert panel.loc[(pd.Timestamp('2024-01-04'), '005930'), 'Close'] == 70000
+    assert str(panel['Close'].dtype) == 'int32'
+
+
+def test_read_range_all_days_failed(monkeypatch):
+    monkeypatch.setattr(krx_listing.transport, 'post', _stub_post({'20240102', '20240103'}, []))
+    with pytest.warns(UserWarning, match='2 of 2 days failed'):
+        panel = KrxMarcapListing('KRX-MARCAP').read_range('2024-01-02', '2024-01-03')
+    assert panel.empty
+
+
+@pytest.fixture
+def delisting_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(KrxDelistingReader, 'cache_dir', str(tmp_path))
+    monkeypatch.setattr(KrxDelistingReader, '_full_codes', {'date': None, 'codes': {}})
+    return tmp_path
+
+
+def _stub_finder(monkeypatch, calls, codes={'036360': 'KR7036360009', '005930': 'KR7005930003'}):
+    def post(url, data=None, **kw):
+        calls.append(data['bld'])
+        block = [{'short_code': short, 'full_code': full} for short, full in codes.items()]
+        return _response(200, json.dumps({'block1': block}).encode())
+    monkeypatch.setattr(krx_data.transport, 'post', post)
+
+
+def test_delisting_map_is_downloaded_once_a_day(monkeypatch, delisting_cache):
+    calls = []
+    _stub_finder(monkeypatch, calls)
+    assert KrxDelistingReader.full_codes()['036360'] == 'KR7036360009'
+    KrxDelistingReader.full_codes()
+    assert calls == ['dbms/comm/finder/finder_listdelisu']
+
+    # 어제 받은 맵은 메모리와 디스크 모두 새로 받음
+    stale = {'date': '20000101', 'codes': {'036360': 'OLD'}}
+    monkeypatch.setattr(KrxDelistingReader, '_full_codes', stale)
+    (delisting_cache / 'krx' / 'delisting_full_codes.json').write_text(json.dumps(stale), encoding='utf-8')
+    assert KrxDelistingReader.full_codes()['036360'] == 'KR7036360009'
+    assert len(calls) == 2
+
+
+def test_delisting_map_is_persisted(monkeypatch, delisting_cache):
+    calls = []
+    _stub_finder(monkeypatch, calls)
+    codes = KrxDelistingReader.full_codes()
+    with open(delisting_cache / 'krx' / 'delisting_full_codes.json', encoding='utf-8') as f:
+        stored = json.load(f)
+    assert stored == {'date': pd.Timestamp.today().strftime('%Y%m%d'), 'codes': codes}
+
+    # 다른 프로세스(메모리의 맵이 없음)는 오늘 저장된 파일을 읽음
+    monkeypatch.setattr(KrxDelistingReader, '_full_codes', {'date': None, 'codes': {}})
+    assert KrxDelistingReader.full_codes() == codes
+    assert len(calls) == 1
+
+
+def test_delisting_resolve(monkeypatch, delisting_cache):
+    calls = []
+    _stub_finder(monkeypatch, calls)
+    assert KrxDelistingReader.resolve(['036360', '000000', '005930']) == {
+        '036360': 'KR7036360009', '000000': None, '005930': 'KR7005930003'}
+    assert len(calls) == 1
+    with pytest.raises(ValueError, match='not found'):
+        KrxDelistingReader('000000')._full_code(KrxDelistingReader.full_codes())
+
+
+def _kind_listing():
+    rows = [('삼성전자', '5930', '반도체', '휴대폰', '1975-06-11'), ('셀트리온제약', '68760', '의약품', '제네릭', '2006-02-17')]
+    cells = ''.join(f'<tr><td>{name}</td><td>{code}</td><td>{sector}</td><td>{industry}</td><td>{day}</td>'
+                    f'<td>12월</td><td>대표</td><td>http://example.com</td><td>서울</td></tr>'
+                    for name, code, sector, industry, day in rows)
+    header = ''.join(f'<th>{col}</th>' for col in
+                     ['회사명', '종목코드', '업종', '주요제품', '상장일', '결산월', '대표자명', '홈페이지', '지역'])
+    return f'<table><tr>{header}</tr>{cells}</table>'.encode('euc-kr')
+
+
+def _stub_master(monkeypatch, calls):
+    def get(url, **kw):
+        calls.append(url)
+        return _response(200, _kind_listing())
+
+    def post(url, data=None, **kw):
+        calls.append(url)
+        block = [{'full_code': 'KR7005930003', 'short_code': '005930', 'codeName': '삼성전자',
+                  'marketEngName': 'KOSPI'},
+                 {'full_code': 'KR7068760000', 'short_code': '068760', 'codeName': '셀트리온제약',
+                  'marketEngName': 'KOSDAQ'}]
+        return _response(200, json.dumps({'block1': block}).encode())
+    monkeypatch.setattr(krx_listing.transport, 'get', get)
+    monkeypatch.setattr(krx_listing.transport, 'post', post)
+
+
+def test_krx_master_is_built_once_per_ttl(monkeypatch):
+    monkeypatch.setattr(KrxStockListing, '_master', {'time': None, 'df': None})
+    calls = []
+    _stub_master(monkeypatch, calls)
+    df = KrxStockListing('KRX', None).read()
+    assert df['Symbol'].tolist() == ['005930', '068760']
+    assert df.loc[df['Symbol'] == '068760', 'Sector'].item() == '의약품'
+    assert KrxStockListing('KOSDAQ', None).read()['Symbol'].tolist() == ['068760']
+    assert len(calls) == 2  # 상장회사목록, 종목검색 한번씩
+
+    df['Name'] = 'changed'  # 반환된 것은 복사본
+    assert KrxStockListing.master()['Name'].tolist() == ['삼성전자', '셀트리온제약']
+    assert len(calls) == 2
+
+    KrxStockListing._master['time'] = time.time() - KrxStockListing.cache_ttl
+    KrxStockListing('KRX', None).read()
+    assert len(calls) == 4
@@ -0,0 +1,189 @@
+import os
+import re
+import datetime
+from io import StringIO
+import pytest
+import requests
+import numpy as np
+import pandas as pd
+from FinanceDataReader._utils import _map_symbols
+from FinanceDataReader._store import ColumnarStore
+from FinanceDataReader.trading_calendar import get_calendar
+from FinanceDataReader.naver import data as naver_data
+from FinanceDataReader.naver import listing as naver_listing
+from FinanceDataReader.naver.data import NaverDailyReader, _parse_fchart
+from FinanceDataReader.naver.listing import NaverStockListing
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures', 'naver')
+
+
+def test_minute_end_date_covers_whole_day():
+    reader = NaverDailyReader('005930', '2024-01-02', '2024-01-03', timeframe='minute')
+    assert reader.end == pd.Timestamp('2024-01-03 23:59:59.999999')
+    assert reader.store is None
+
+
+def test_minute_end_with_time_is_kept():
+    reader = NaverDailyReader('005930', '2024-01-02', '2024-01-03 10:30', timeframe='minute')
+    assert reader.end == pd.Timestamp('2024-01-03 10:30')
+
+
+def test_minute_bar_count_scales_sessions():
+    reader = NaverDailyReader('005930', '2024-01-02', timeframe='minute')
+    day = NaverDailyReader('005930', '2024-01-02')
+    since = pd.Timestamp.today().normalize() - pd.Timedelta(days=10)
+    sessions = day._bar_count(since) - 1 - day.count_margin
+    assert reader._bar_count(since) == min(sessions * reader.minutes_per_session + 1 + reader.count_margin,
+                                           reader.max_count)
+
+
+def _response(status_code, content=b''):
+    r = requests.Response()
+    r.status_code, r._content, r.url = status_code, content, 'https://www.choicestock.co.kr/'
+    return r
+
+
+def test_choicestock_errors_are_reported(monkeypatch):
+    monkeypatch.setattr(naver_listing.transport, 'get', lambda url, **kw: _response(403))
+    listing = NaverStockListing('NYSE', DataReader=lambda *args: pd.DataFrame())
+    today = datetime.date(2024, 1, 2)
+    with pytest.warns(UserWarning, match='1 of 1 symbols failed'):
+        records, errors = _map_symbols(lambda code: listing._parse_symbol(*listing._fetch_symbol(code, today), today),
+                                       ['AAPL'], retries=1, progress_every=None)
+    assert not records
+    assert isinstance(errors['AAPL'], requests.HTTPError)
+
+
+def test_choicestock_pages_are_returned(monkeypatch):
+    monkeypatch.setattr(naver_listing.transport, 'get', lambda url, **kw: _response(200, url.encode()))
+    listing = NaverStockListing('NYSE', DataReader=lambda *args: pd.DataFrame())
+    _, pages = listing._fetch_symbol('AAPL', datetime.date(2024, 1, 2))
+    assert pages == [url.format(code='AAPL').encode() for url in listing.choicestock_urls]
+
+
+def _read_fixture(name):
+    with open(os.path.join(fixtures, name), 'rb') as f:
+        return f.read()
+
+
+def _parse_read_csv(content):
+    # 이전 방식: 정규식으로 item 을 찾아 이어 붙인 뒤 read_csv
+    data_list = re.findall('<item data=\"(.*?)\" />', content.decode('euc-kr'), re.DOTALL)
+    df = pd.read_csv(StringIO('\n'.join(data_list)), delimiter='|', header=None, dtype={0: str})
+    df.columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y%m%d')
+    return df.set_index('Date').sort_index()
+
+
+def test_parse_fchart_matches_read_csv_path():
+    content = _read_fixture('fchart_day.xml')
+    new = NaverDailyReader('005930')._frame(_parse_fchart(content))
+    assert len(new) == 300
+    assert new['Close'].dtype == np.int64
+    pd.testing.assert_frame_equal(_parse_read_csv(content), new, check_dtype=False, check_index_type=False,
+                                  check_freq=False)
+
+
+def test_parse_fchart_minute_nulls_and_decimals():
+    content = (b'<item data="202401020900|null|null|null|78500|1200" />\n'
+               b'<item data="202401020901|78500|78600|78400|78550.5|300" />')
+    cols = _parse_fchart(content)
+    assert list(pd.DatetimeIndex(cols['Date'])) == list(pd.to_datetime(['2024-01-02 09:00', '2024-01-02 09:01']))
+    assert cols['Open'].tolist() == [78500., 78500.]
+    assert cols['Close'].tolist() == [78500., 78550.5]
+    assert cols['Volume'].tolist() == [1200, 300]
+    assert _parse_fchart(b'<chartdata></chartdata>') is None
+
+
+def test_minute_frame_keeps_decimal_prices():
+    reader = NaverDailyReader('005930', '2024-01-02', timeframe='minute')
+    content = (b'<item data="202401020900|78500.5|78600|78400|78550.5|300" />\n'
+               b'<item data="202401020901|78500|78600|78400|78550|200" />')
+    df = reader._frame(_parse_fchart(content))
+    assert df['Close'].dtype == np.float64
+    assert df['Close'].tolist() == [78550.5, 78550.]
+    assert df['Open'].tolist() == [78500.5, 78500.]
+
+
+def test_minute_frame_downcasts_integral_prices():
+    reader = NaverDailyReader('005930', '2024-01-02', timeframe='minute')
+    df = reader._frame(_parse_fchart(b'<item data="202401020900|null|null|null|78500|1200" />'))
+    assert (df[['Open', 'High', 'Low', 'Close']].dtypes == np.int32).all()
+    assert df['Volume'].dtype == np.int64
+    assert df['Open'].tolist() == [78500]
+
+
+def _fchart(df):
+    lines = [f'<item data="{d:%Y%m%d}|{o}|{h}|{lo}|{c}|{v}" />'
+             for d, o, h, lo, c, v in df.reset_index().itertuples(index=False)]
+    return '\n'.join(lines).encode()
+
+
+def _stub_fchart(monkeypatch, history, counts):
+    # count= 로 요청된 만큼 history 의 최근 봉을 fchart 형식으로 응답
+    def get(url, **kw):
+        count = int(re.search(r'count=(\d+)', url).group(1))
+        counts.append(count)
+        r = requests.Response()
+        r.status_code, r._content, r.url = 200, _fchart(history[-count:]), url
+        return r
+    monkeypatch.setattr(naver_data.transport, 'get', get)
+
+
+def _history(sessions, close):
+    index = pd.DatetimeIndex(sessions, name='Date')
+    close = np.asarray(close, dtype=np.int64)
+    return pd.DataFrame({'Open': close, 'High': close + 100, 'Low': close - 100, 'Close': close,
+                         'Volume': np.full(len(close), 1000)}, index=index)
+
+
+def _recent_sessions(n):
+    today = pd.Timestamp.today().normalize()
+    sessions = get_calendar('KRX').sessions_in_range(today - pd.Timedelta(days=3 * n), today)
+    return pd.DatetimeIndex(sessions)[-n:]
+
+
+def test_incremental_read_appends_new_bars(monkeypatch, tmp_path):
+    sessions = _recent_sessions(40)
+    counts = []
+    _stub_fchart(monkeypatch, _history(sessions[:30], np.arange(30) * 10 + 50000), counts)
+    NaverDailyReader('005930', sessions[0], cache_dir=str(tmp_path)).read()
+    assert counts == [NaverDailyReader.max_counts['day']]
+
+    _stub_fchart(monkeypatch, _history(sessions, np.arange(40) * 10 + 50000), counts)
+    df = NaverDailyReader('005930', sessions[0], cache_dir=str(tmp_path)).read()
+    assert counts[1] < 30  # 마지막 저장일 이후만 요청
+    assert list(df.index) == list(sessions)
+    assert df['Close'].tolist() == (np.arange(40) * 10 + 50000).tolist()
+
+
+def test_incremental_read_refetches_restated_history(monkeypatch, tmp_path):
+    sessions = _recent_sessions(40)
+    counts = []
+    _stub_fchart(monkeypatch, _history(sessions[:30], np.arange(30) * 10 + 50000), counts)
+    NaverDailyReader('005930', sessions[0], cache_dir=str(tmp_path)).read()
+
+    # 1:50 액면분할로 과거 가격이 모두 수정됨
+    split = _history(sessions, (np.arange(40) * 10 + 50000) // 50)
+    _stub_fchart(monkeypatch, split, counts)
+    df = NaverDailyReader('005930', sessions[0], cache_dir=str(tmp_path)).read()
+    assert counts[-1] == NaverDailyReader.max_counts['day']
+    assert df['Close'].tolist() == split['Close'].tolist()
+    stored = ColumnarStore(str(tmp_path), 'naver/day').load('005930')
+    assert stored['Close'].tolist() == split['Close'].tolist()
+
+
+def test_restated_ignores_the_intraday_last_bar():
+    sessions = _recent_sessions(5)
+    stored = _history(sessions[:3], [100, 101, 102])
+    assert not NaverDailyReader._restated(stored, _history(sessions, [100, 101, 105, 106, 107]))
+    assert NaverDailyReader._restated(stored, _history(sessions, [2, 101, 105, 106, 107]))
+    assert NaverDailyReader._restated(stored.iloc[-1:], _history(sessions[2:], [2, 106, 107]))
+    assert not NaverDailyReader._restated(stored, _history(sessions[3:], [106, 107]))
+
+
+def test_listing_page_error_carries_the_response(monkeypatch, capsys):
+    monkeypatch.setattr(naver_listing.transport, 'get', lambda url, **kw: _response(503, b'<html>busy</html>'))
+    with pytest.raises(Exception, match="503 .*response: '<html>busy</html>'"):
+        NaverStockListing('NYSE', DataReader=None).read()
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,36 @@
+import pandas as pd
+from FinanceDataReader._store import ColumnarStore
+
+
+def _bars(dates, close):
+    index = pd.DatetimeIndex(pd.to_datetime(dates), name='Date')
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 100}, index=index)
+
+
+def test_load_missing_symbol(tmp_path):
+    assert ColumnarStore(str(tmp_path), 'naver/day').load('005930') is None
+
+
+def test_save_and_load(tmp_path):
+    store = ColumnarStore(str(tmp_path), 'naver/day')
+    df = _bars(['2024-01-02', '2024-01-03'], [100, 101])
+    store.save('005930', df)
+    assert (tmp_path / 'naver' / 'day' / f'005930.{store.ext}').exists()
+    pd.testing.assert_frame_equal(store.load('005930'), df, check_freq=False)
+
+
+def test_append_merges_and_new_rows_win(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    store.save('005930', _bars(['2024-01-02', '2024-01-03'], [100, 101]))
+    merged = store.append('005930', _bars(['2024-01-04', '2024-01-03'], [103, 102]))
+    assert list(merged.index) == list(pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-04']))
+    assert merged['Close'].tolist() == [100, 102, 103]
+    pd.testing.assert_frame_equal(store.load('005930'), merged, check_freq=False)
+
+
+def test_symbol_with_slash_and_remove(tmp_path):
+    store = ColumnarStore(str(tmp_path), 'fred')
+    store.save('A/B', _bars(['2024-01-02'], [1]))
+    assert store.load('A/B') is not None
+    store.remove('A/B')
+    assert store.load('A/B') is None
@@ -0,0 +1,70 @@
+import warnings
+import pytest
+import pandas as pd
+from FinanceDataReader.trading_calendar import TradingCalendar, get_calendar
+
+
+# 휴일 규칙으로 정해지는 연간 거래일 수 (선거일, 태풍 등 임시 휴장이 없는 연도)
+@pytest.mark.parametrize('exchange, year, sessions', [
+    ('KRX', 2019, 246),
+    ('NYSE', 2023, 250),
+    ('NYSE', 2024, 252),
+    ('TSE', 2024, 245),
+    ('TSE', 2026, 242),
+    ('HKEX', 2024, 247),
+])
+def test_session_count(exchange, year, sessions):
+    cal = get_calendar(exchange, end_year=2030)
+    assert cal.session_count(f'{year}-01-01', f'{year}-12-31') == sessions
+    assert len(cal.sessions_in_range(f'{year}-01-01', f'{year}-12-31')) == sessions
+
+
+@pytest.mark.parametrize('exchange, day', [
+    ('KRX', '2022-12-30'),  # 연말 휴장일: 12/31 이 토요일
+    ('KRX', '2023-12-29'),  # 12/31 이 일요일
+    ('KRX', '2028-12-29'),
+    ('KRX', '2024-12-31'),
+    ('HKEX', '2024-10-11'),  # 중양절
+    ('HKEX', '2024-02-13'),  # 설 연휴의 일요일 대체
+    ('HKEX', '2023-05-26'),  # 석가탄신일 (중국 음력)
+    ('HOSE', '2024-04-18'),  # 훙왕 기일
+    ('HOSE', '2023-05-03'),  # 주말과 겹친 휴일의 대체
+    ('TSE', '2026-09-22'),  # 国民の休日
+    ('TSE', '2015-09-22'),
+])
+def test_holidays(exchange, day):
+    assert not get_calendar(exchange, end_year=2030).is_session(day)
+
+
+def test_krx_last_session_of_year():
+    cal = get_calendar('KRX', end_year=2030)
+    assert cal.is_session('2022-12-29')
+    assert cal.previous_session('2023-01-02') == pd.Timestamp('2022-12-29')
+
+
+def test_out_of_tabled_years_warns():
+    cal = get_calendar('KRX', end_year=2031)
+    with pytest.warns(UserWarning, match='2015-01-01 ~ 2030-12-31'):
+        cal.is_session('2014-01-31')
+    with pytest.warns(UserWarning, match='2015-01-01 ~ 2030-12-31'):
+        cal.sessions_in_range('2030-12-01', '2031-01-23')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        cal.session_count('2015-01-01', '2030-12-31')
+        get_calendar('NYSE', end_year=2031).is_session('2014-01-31')
+
+
+def test_vectorized_lookups():
+    cal = get_calendar('KRX', end_year=2030)
+    days = pd.to_datetime(['2024-02-09', '2024-02-13'])
+    assert cal.is_session(days).tolist() == [False, True]
+    assert list(cal.next_session(days)) == list(pd.to_datetime(['2024-02-13', '2024-02-14']))
+
+
+def test_from_history_extends_with_rules():
+    cal = get_calendar('KRX', end_year=2030)
+    history = cal.sessions_in_range('2024-01-02', '2024-03-29').drop(pd.Timestamp('2024-03-15'))
+    merged = TradingCalendar.from_history(history, extend=cal)
+    assert not merged.is_session('2024-03-15')
+    assert not merged.is_session('2024-05-15')
+    assert merged.name == 'KRX'
@@ -0,0 +1,95 @@
+import pytest
+from FinanceDataReader.transport import RateLimiter, _retry_after
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+def test_burst_then_refill(clock):
+    limiter = RateLimiter(rate=2., burst=3, host_rates={}, clock=clock)
+    assert [limiter.reserve('a') for _ in range(3)] == [0., 0., 0.]
+    assert limiter.reserve('a') == pytest.approx(0.5)  # 토큰이 없으면 1/rate 초 뒤
+    assert limiter.reserve('a') == pytest.approx(1.0)
+    clock.now += 10.  # 쉬는 동안 burst 까지만 다시 채워짐
+    assert [limiter.reserve('a') for _ in range(3)] == [0., 0., 0.]
+    assert limiter.reserve('a') == pytest.approx(0.5)
+
+
+def test_hosts_are_independent(clock):
+    limiter = RateLimiter(rate=1., burst=1, host_rates={'slow': (0.5, 1)}, clock=clock)
+    assert limiter.reserve('a') == 0.
+    assert limiter.reserve('slow') == 0.
+    assert limiter.reserve('a') == pytest.approx(1.)
+    assert limiter.reserve('slow') == pytest.approx(2.)
+
+
+def test_unlimited_rate(clock):
+    limiter = RateLimiter(rate=None, host_rates={}, clock=clock)
+    assert all(limiter.reserve('a') == 0. for _ in range(100))
+
+
+def test_throttled_halves_rate_and_success_recovers(clock):
+    limiter = RateLimiter(rate=8., burst=1, host_rates={}, min_rate=1., recovery=0.25, clock=clock)
+    limiter.reserve('a')
+    limiter.feedback('a', 429)
+    assert limiter._buckets['a']['rate'] == 4.
+    limiter.feedback('a', 503)
+    assert limiter._buckets['a']['rate'] == 2.
+    for _ in range(3):
+        limiter.feedback('a', 500)
+    assert limiter._buckets['a']['rate'] == 1.  # min_rate 아래로는 줄지 않음
+    limiter.feedback('a', 200)
+    assert limiter._buckets['a']['rate'] == 3.
+    for _ in range(10):
+        limiter.feedback('a', 200)
+    assert limiter._buckets['a']['rate'] == 8.  # 설정한 rate 까지만 회복
+    limiter.feedback('a', 404)
+    assert limiter._buckets['a']['rate'] == 8.
+
+
+def test_throttled_pauses_one_interval(clock):
+    limiter = RateLimiter(rate=4., burst=10, host_rates={}, clock=clock)
+    limiter.reserve('a')
+    limiter.feedback('a', 502)
+    assert limiter.reserve('a') == pytest.approx(0.5)  # 반으로 줄인 rate 의 한 간격
+    clock.now += 0.5
+    assert limiter.reserve('a') == 0.
+
+
+def test_retry_after_pauses_host(clock):
+    limiter = RateLimiter(rate=4., burst=10, host_rates={}, clock=clock)
+    limiter.reserve('a')
+    limiter.feedback('a', 429, _retry_after({'Retry-After': '7'}))
+    assert limiter.reserve('a') == pytest.approx(7.)
+    assert limiter.reserve('b') == 0.
+    clock.now += 5.
+    assert limiter.reserve('a') == pytest.approx(2.)
+    clock.now += 2.
+    assert limiter.reserve('a') == 0.
+
+
+def test_retry_after_header():
+    assert _retry_after({'Retry-After': '3'}) == 3.
+    assert _retry_after({'Retry-After': '-1'}) == 0.
+    assert _retry_after({'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}) == 0.  # 지난 시각
+    assert _retry_after({'Retry-After': 'soon'}) is None
+    assert _retry_after({}) is None
+
+
+def test_set_rate_and_fchart_default(clock):
+    limiter = RateLimiter(clock=clock)
+    assert limiter._limits('fchart.stock.naver.com') == (30, 60)
+    assert limiter._limits('example.com') == (10., 20)
+    limiter.set_rate('example.com', 1.)
+    assert limiter._limits('example.com') == (1., 2)
+    assert [limiter.reserve('example.com') for _ in range(3)] == [0., 0., pytest.approx(1.)]
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from FinanceDataReader._utils import (_compact, _to_panel, _convert_letter_to_num, _convert_letter_to_num_series,
+                                     _filter_by_date)
+
+
+def test_compact_downcasts_integral_floats():
+    df = _compact(pd.DataFrame({'a': [1.0, 2.0], 'b': [1, 2 ** 40], 'c': [0.5, 1.25]}))
+    assert df['a'].dtype == np.int32
+    assert df['b'].dtype == np.int64
+    assert df['c'].dtype == np.float32
+
+
+def test_compact_keeps_floats_beyond_int64():
+    df = _compact(pd.DataFrame({'PSR_0': [5e22, 1e20]}))
+    assert df['PSR_0'].dtype.kind == 'f'
+    assert df['PSR_0'].tolist() == [5e22, 1e20]
+
+
+def test_compact_keeps_inf():
+    df = _compact(pd.DataFrame({'a': [1.0, np.inf, -np.inf]}))
+    assert df['a'].dtype.kind == 'f'
+    assert np.isinf(df['a'].iloc[1:]).all()
+
+
+def test_compact_keeps_integral_floats_beyond_2_53():
+    values = [2.0 ** 60, 1.0]
+    df = _compact(pd.DataFrame({'a': values}))
+    assert df['a'].tolist() == values
+
+
+def test_to_panel_aligns_dates():
+    a = pd.DataFrame({'Close': [1., 2.]}, index=pd.to_datetime(['2024-01-02', '2024-01-03']))
+    b = pd.DataFrame({'Close': [3.]}, index=pd.to_datetime(['2024-01-03']))
+    close = _to_panel({'A': a, 'B': b}, ['Close'])['Close']
+    assert close.index.name == 'Date'
+    assert close['A'].tolist() == [1., 2.]
+    assert np.isnan(close['B'].iloc[0]) and close['B'].iloc[1] == 3.
+
+
+def test_to_panel_rejects_frames_without_dates():
+    df = pd.DataFrame({'Date': pd.to_datetime(['2024-01-02']), 'Close': [1.]})
+    with pytest.raises(ValueError):
+        _to_panel({'A': df})
+
+
+letter_cases = ['1.5M', '2B', '730K', '12', '0.25K', '1,234K', '1,234.5', '12,345,678', '-', '', ' ', 'n/a', '3.2M ']
+
+
+def test_convert_letter_to_num_series_matches_scalar():
+    s = pd.Series(letter_cases)
+    expected = [_convert_letter_to_num(x) for x in letter_cases]
+    assert _convert_letter_to_num_series(s).tolist() == expected
+
+
+def test_convert_letter_to_num_series_missing_is_zero():
+    s = pd.Series(['1K', np.nan, None, '2M'], dtype=object)
+    assert _convert_letter_to_num_series(s).tolist() == [1000., 0., 0., 2000000.]
+
+
+def test_filter_by_date_is_inclusive_and_sorts():
+    index = pd.to_datetime(['2024-01-04', '2024-01-02', '2024-01-03', '2024-01-05'])
+    df = pd.DataFrame({'Close': [4, 2, 3, 5]}, index=index)
+    out = _filter_by_date(df, '2024-01-03', pd.Timestamp('2024-01-04'))
+    assert list(out.index) == list(pd.to_datetime(['2024-01-03', '2024-01-04']))
+    assert out['Close'].tolist() == [3, 4]
+    assert not len(_filter_by_date(df, '2025-01-01', '2025-12-31'))
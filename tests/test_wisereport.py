@@ -0,0 +1,96 @@
+import os
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import pytest
+import requests
+import pandas as pd
+from FinanceDataReader.krx.wisereport import WisereportFetcher
+from FinanceDataReader.krx.listing import KrxStockListing
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures', 'wisereport')
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # /v2/company/<page>.aspx 를 fixtures/wisereport/<page>.html (cF3002 는 rpt 별 json) 으로 응답
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.server.hits.append(url.path)
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.end_headers()
+            return
+        page = os.path.basename(url.path).replace('.aspx', '')
+        if page == 'cF3002':
+            fn = f"cF3002_{parse_qs(url.query)['rpt'][0]}.json"
+        else:
+            fn = f'{page}.html'
+        with open(os.path.join(fixtures, fn), 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json' if fn.endswith('.json') else 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.hits, server.status = [], 200
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetcher(server):
+    return WisereportFetcher(base_url=f'http://127.0.0.1:{server.server_address[1]}')
+
+
+def test_summary_rows(stub):
+    rows = dict(_fetcher(stub).summary('005930'))
+    assert rows['시가총액'] == ['4,380,000억원']
+    assert rows['PER'] == ['10.50', '11.20', '12.30', '13.10', '14.20']
+    assert rows['FCF'][4] == '5,000'
+
+
+def test_financial_statements_fetch_encparam_page_once(stub):
+    statements = _fetcher(stub).financial_statements('005930')
+    assert stub.hits.count('/v2/company/c1030001.aspx') == 1
+    assert stub.hits.count('/v2/company/cF3002.aspx') == 3
+    profit, position, cash_flow = [dict(rows) for rows in statements]
+    assert profit['영업이익'] == ['영업이익', '50000.0', '60000.0', '70000.0', '80000.0', '90000.0', '']
+    assert set(position) == {'자산총계', '단기차입금', '사채'}
+    assert cash_flow['영업활동으로인한현금흐름'][1] == '70000.0'
+
+
+def test_financial_statement_single_report(stub):
+    rows = dict(_fetcher(stub).financial_statement('005930', 'cash_flow'))
+    assert list(rows) == ['영업활동으로인한현금흐름']
+
+
+def test_failures_are_raised_without_chromedriver(stub):
+    stub.status = 403
+    fetcher = _fetcher(stub)
+    with pytest.raises(requests.HTTPError):
+        fetcher.summary('005930')
+    with pytest.raises(requests.HTTPError):
+        fetcher.financial_statements('005930')
+
+
+def test_parse_symbol_reads_fixture_pages(stub):
+    fetcher = _fetcher(stub)
+    listing = KrxStockListing('KRX', DataReader=None)
+    pages = [fetcher.summary('005930')] + fetcher.financial_statements('005930', listing.statements)
+    record = listing._parse_symbol(pd.DataFrame(), pages, datetime.date(2024, 1, 2))
+    assert record['data_exists']
+    assert record['시가총액_0'] == 4380000.
+    assert (record['PER_0'], record['PER_1'], record['PER_4']) == (14.2, 13.1, 10.5)
+    assert (record['영업이익_0'], record['영업이익_1'], record['영업이익_4']) == (90000., 80000., 50000.)
+    assert record['자산총계_0'] == 4400000.